@@ -0,0 +1,20 @@
+"""
+Badge checks shared by the diagnostic test_*.py scripts.
+"""
+
+# badge -> does it mark a guest favourite? The badge vocabulary is tiny, so
+# after the first few listings every check is a single dict lookup instead of
+# str()/upper()/substring work per badge. Substring (not exact) match on
+# purpose: TOP_X_GUEST_FAVORITE badges count too.
+GF_BADGE = {}
+
+
+def is_guest_favorite(r):
+    for b in (r.get('badges') or ()):
+        key = b if isinstance(b, str) else str(b)
+        hit = GF_BADGE.get(key)
+        if hit is None:
+            hit = GF_BADGE[key] = 'GUEST_FAVORITE' in key.upper()
+        if hit:
+            return True
+    return False
@@ -0,0 +1,54 @@
+"""
+Small on-disk key/value cache for scraper results (SQLite in WAL mode).
+
+Values are opaque bytes; callers pick the key and the TTL on read. Cache
+failures are never fatal — a broken cache just means a fresh scrape.
+Set AIRBNB_CACHE_DB to move the database (default ~/.cache/airbnb-alerts).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_PATH = os.getenv('AIRBNB_CACHE_DB') or os.path.expanduser('~/.cache/airbnb-alerts/cache.sqlite3')
+
+_conn = None
+_lock = threading.Lock()
+
+
+def _connect():
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        conn = sqlite3.connect(CACHE_PATH, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute('pragma journal_mode=wal')
+        conn.execute('pragma synchronous=normal')
+        conn.execute('create table if not exists cache (key text primary key, ts real not null, value blob not null)')
+        _conn = conn
+    return _conn
+
+
+def get(key, ttl):
+    """Return the cached bytes for `key` if written less than `ttl` seconds ago, else None."""
+    try:
+        with _lock:
+            row = _connect().execute('select ts, value from cache where key = ?', (key,)).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        print(f"DEBUG: cache read failed ({e})")
+        return None
+    if row is None or time.time() - row[0] > ttl:
+        return None
+    return bytes(row[1])
+
+
+def put(key, value):
+    """Store `value` (bytes) under `key`, stamped with the current time."""
+    try:
+        with _lock:
+            _connect().execute(
+                'insert or replace into cache (key, ts, value) values (?, ?, ?)',
+                (key, time.time(), value),
+            )
+    except (sqlite3.Error, OSError) as e:
+        print(f"DEBUG: cache write failed ({e})")
@@ -15,10 +15,21 @@ Builds rawParams correctly from the original URL, including:
   - neLat/neLng/swLat/swLng/zoomLevel
 """
 
-from urllib.parse import urlparse, parse_qs, urlencode
+from urllib.parse import urlparse, unquote_plus, urlencode
+import asyncio
+import base64
+from collections import defaultdict
+from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
+import hashlib
 from curl_cffi import requests as cffi_requests
-import json
+import fastjson
+import _cache
+import os
 import re
+import threading
+import time
 
 # ── Hardcoded in pyairbnb, works as fallback ──────────────────────────────
 DEFAULT_HASH = 'e75ccaa7c9468e19d7613208b37d05f9b680529490ca9bc9d3361202ca0a4e43'
@@ -33,6 +44,19 @@ HEADERS = {
     "Sec-Ch-Ua-Platform": '"Windows"',
 }
 
+# One keep-alive session for the GraphQL POSTs and search-page fetch, so a
+# paginated search reuses its TCP/TLS connection instead of re-handshaking
+# per page. Proxies are passed per request.
+_session = cffi_requests.Session(impersonate="chrome124")
+
+# Plain UA-only headers for the search page / JS bundle fetches
+_UA_HEADERS = {"User-Agent": HEADERS["User-Agent"]}
+
+# muscache JS bundle URLs referenced from the search page
+_MUSCACHE_RE = re.compile(r"https://a0\.muscache\.com/airbnb/static/packages/web/[^\"'\s]+\.js")
+# name:'StaysSearch',type:'query',operationId:'<64-char-hex>'
+_OPID_RE = re.compile(r"name:['\"]StaysSearch['\"][^}]{0,100}operationId:['\"]([0-9a-f]{64})['\"]")
+
 TREATMENTS = [
     "feed_map_decouple_m11_treatment",
     "stays_search_rehydration_treatment_desktop",
@@ -42,47 +66,161 @@ TREATMENTS = [
 ]
 
 
+class SearchHTTPError(Exception):
+    """Non-200 response from the StaysSearch endpoint."""
+    def __init__(self, status_code, body=""):
+        super().__init__(f"HTTP {status_code}: {body}")
+        self.status_code = status_code
+
+
+class StaleOpHashError(SearchHTTPError):
+    """StaysSearch no longer knows the persisted-query hash we sent."""
+
+
+# GraphQL's answer to an unknown persisted query, as an error message or code
+_STALE_HASH_RE = re.compile(rb"persisted_?query_?not_?found", re.I)
+
+
+def _decode_search_response(status_code, content):
+    """Parsed StaysSearch body; raises SearchHTTPError / StaleOpHashError on failure."""
+    if status_code != 200:
+        if _STALE_HASH_RE.search(content):
+            raise StaleOpHashError(status_code, content[:300].decode("utf-8", "replace"))
+        raise SearchHTTPError(status_code, content[:300].decode("utf-8", "replace"))
+    data = fastjson.loads(content)
+    if data.get("errors") and _STALE_HASH_RE.search(content):
+        raise StaleOpHashError(status_code, "PersistedQueryNotFound")
+    return data
+
+
 def get_api_key(proxy_url=""):
     """Fetch Airbnb API key (same as pyairbnb.api.get)"""
     import pyairbnb.api as api
     return api.get(proxy_url)
 
 
+def _unquote(s):
+    return unquote_plus(s) if "%" in s or "+" in s else s
+
+
+# Keys repeat heavily (amenities%5B%5D, selected_filter_order%5B%5D, ...) and
+# come from a small fixed vocabulary, so decode each distinct one only once.
+_unquote_key = functools.lru_cache(maxsize=256)(_unquote)
+
+
+def _parse_qs_fast(query, keep=None):
+    """
+    Minimal parse_qs: split on & and =, only percent-decode parts that need
+    it. Like parse_qs, blank values are dropped and repeated keys collect
+    into a list (room_types[], amenities[], selected_filter_order[]).
+    With `keep`, keys outside that set are dropped before their values are
+    decoded.
+    """
+    qs = defaultdict(list)
+    for part in query.split("&"):
+        k, _, v = part.partition("=")
+        if not v:
+            continue
+        k = _unquote_key(k)
+        if keep is not None and k not in keep:
+            continue
+        qs[k].append(_unquote(v))
+    return qs
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_ymd(s):
+    """YYYY-MM-DD → date; slices the canonical form, strptime for anything else."""
+    if len(s) == 10 and s[4] == "-" and s[7] == "-":
+        return date(int(s[:4]), int(s[5:7]), int(s[8:10]))
+    return datetime.strptime(s, "%Y-%m-%d").date()
+
+
+# The querystring fields build_raw_params() reads: name → (URL keys in
+# priority order, default), plus name → repeated list key. build_raw_params
+# only reads through these tables and RAW_PARAM_KEYS is derived from them, so
+# the two can't drift apart. The rest of a saved
+# search URL (search_type, channel, monthly_*, flexible_*,
+# update_selected_filters, ...) is UI state and can be dropped while parsing.
+_RAW_PARAM_FIELDS = {
+    "ne_lat":         (("ne_lat",), None),
+    "ne_lng":         (("ne_lng", "ne_long"), None),
+    "sw_lat":         (("sw_lat",), None),
+    "sw_lng":         (("sw_lng", "sw_long"), None),
+    "zoom":           (("zoom_level", "zoom"), "12"),
+    "place_id":       (("place_id",), ""),
+    "query":          (("query",), ""),
+    "check_in":       (("checkin",), None),
+    "check_out":      (("checkout",), None),
+    "price_min":      (("price_min",), None),
+    "price_max":      (("price_max",), None),
+    "min_beds":       (("min_beds",), None),
+    "min_bedrooms":   (("min_bedrooms",), None),
+    "min_bathrooms":  (("min_bathrooms",), None),
+    "adults":         (("adults",), None),
+    "children":       (("children",), None),
+    "infants":        (("infants",), None),
+    "ib":             (("ib",), "false"),
+    "guest_favorite": (("guest_favorite",), "false"),
+    "free_cancellation": (("flexible_cancellation",), "false"),
+}
+_RAW_PARAM_LISTS = {
+    "room_types":   "room_types[]",
+    "amenities":    "amenities[]",
+    "filter_order": "selected_filter_order[]",
+}
+
+RAW_PARAM_KEYS = frozenset(
+    [key for keys, _ in _RAW_PARAM_FIELDS.values() for key in keys] + list(_RAW_PARAM_LISTS.values())
+)
+
+
+def _raw_param_fields(qs):
+    """First value of each _RAW_PARAM_FIELDS entry (first URL key present wins)."""
+    fields = {}
+    for name, (keys, default) in _RAW_PARAM_FIELDS.items():
+        value = default
+        for key in keys:
+            vals = qs.get(key)
+            if vals:
+                value = vals[0]
+                break
+        fields[name] = value
+    return fields
+
+
 def build_raw_params(qs):
     """
     Build the rawParams list from parsed URL querystring.
     This is what pyairbnb's search.get() should do but doesn't —
     it hardcodes Galapagos placeId/query instead of reading from URL.
     """
-    def first(key, default=None):
-        vals = qs.get(key, [])
-        return vals[0] if vals else default
-
-    ne_lat   = first("ne_lat",  first("ne_lat"))
-    ne_lng   = first("ne_lng",  first("ne_long"))
-    sw_lat   = first("sw_lat")
-    sw_lng   = first("sw_lng",  first("sw_long"))
-    zoom     = first("zoom_level", first("zoom", "12"))
-    place_id = first("place_id", "")
-    query    = first("query", "")
-    check_in  = first("checkin")
-    check_out = first("checkout")
-    price_min = first("price_min")
-    price_max = first("price_max")
-    min_beds  = first("min_beds")
-    min_bedrooms = first("min_bedrooms")
-    min_bathrooms = first("min_bathrooms")
-    adults   = first("adults")
-    children = first("children")
-    infants  = first("infants")
-    ib       = first("ib", "false")
-    guest_favorite = first("guest_favorite", "false")
-    room_types = qs.get("room_types[]", [])
-    amenities  = qs.get("amenities[]", [])
-    free_cancellation = first("flexible_cancellation", "false")
+    f = _raw_param_fields(qs)
+    ne_lat   = f["ne_lat"]
+    ne_lng   = f["ne_lng"]
+    sw_lat   = f["sw_lat"]
+    sw_lng   = f["sw_lng"]
+    zoom     = f["zoom"]
+    place_id = f["place_id"]
+    query    = f["query"]
+    check_in  = f["check_in"]
+    check_out = f["check_out"]
+    price_min = f["price_min"]
+    price_max = f["price_max"]
+    min_beds  = f["min_beds"]
+    min_bedrooms = f["min_bedrooms"]
+    min_bathrooms = f["min_bathrooms"]
+    adults   = f["adults"]
+    children = f["children"]
+    infants  = f["infants"]
+    ib       = f["ib"]
+    guest_favorite = f["guest_favorite"]
+    room_types = qs.get(_RAW_PARAM_LISTS["room_types"], [])
+    amenities  = qs.get(_RAW_PARAM_LISTS["amenities"], [])
+    free_cancellation = f["free_cancellation"]
 
     # selected_filter_order — preserve original order from URL
-    filter_order = qs.get("selected_filter_order[]", [])
+    filter_order = qs.get(_RAW_PARAM_LISTS["filter_order"], [])
 
     # ── Base params (always sent) ─────────────────────────────────────────
     raw = [
@@ -122,8 +260,7 @@ def build_raw_params(qs):
 
     # ── Dates ─────────────────────────────────────────────────────────────
     if check_in and check_out:
-        from datetime import datetime
-        days = (datetime.strptime(check_out, "%Y-%m-%d") - datetime.strptime(check_in, "%Y-%m-%d")).days
+        days = (_parse_ymd(check_out) - _parse_ymd(check_in)).days
         raw += [
             {"filterName": "checkin",             "filterValues": [check_in]},
             {"filterName": "checkout",            "filterValues": [check_out]},
@@ -176,12 +313,35 @@ def build_raw_params(qs):
     return raw
 
 
-def search_page(api_key, cursor, raw_params, currency, language, op_hash, proxy_url=""):
-    """Call Airbnb's StaysSearch GraphQL endpoint for one page."""
+@functools.lru_cache(maxsize=512)
+def _build_raw_params_cached(query_str):
+    # Frozen as tuples so the cached value can't be mutated by a caller
+    raw = build_raw_params(_parse_qs_fast(query_str, keep=RAW_PARAM_KEYS))
+    return tuple((p["filterName"], tuple(p["filterValues"])) for p in raw)
+
+
+def raw_params_for_query(query_str):
+    """
+    build_raw_params() for a raw URL querystring, memoized — a watcher
+    polling the same saved URL only parses it once per process.
+    """
+    return [{"filterName": name, "filterValues": list(values)}
+            for name, values in _build_raw_params_cached(query_str)]
+
+
+def request_headers(api_key):
+    """HEADERS plus the API key — build once per key and reuse for every page."""
+    return {**HEADERS, "X-Airbnb-Api-Key": api_key}
+
+
+def search_url(op_hash, currency, language):
     base_url = f"https://www.airbnb.com/api/v3/StaysSearch/{op_hash}"
-    url = f"{base_url}?{urlencode({'operationName': 'StaysSearch', 'locale': language, 'currency': currency})}"
+    return f"{base_url}?{urlencode({'operationName': 'StaysSearch', 'locale': language, 'currency': currency})}"
+
 
-    payload = {
+def search_payload(raw_params, op_hash, cursor=""):
+    """StaysSearch request body — across pages only the two cursors change."""
+    return {
         "operationName": "StaysSearch",
         "extensions": {
             "persistedQuery": {"version": 1, "sha256Hash": op_hash}
@@ -213,13 +373,75 @@ def search_page(api_key, cursor, raw_params, currency, language, op_hash, proxy_
         },
     }
 
-    headers = {**HEADERS, "X-Airbnb-Api-Key": api_key}
-    proxies = {"http": proxy_url, "https": proxy_url} if proxy_url else {}
 
-    resp = cffi_requests.post(url, json=payload, headers=headers, proxies=proxies, impersonate="chrome124")
-    if resp.status_code != 200:
-        raise Exception(f"HTTP {resp.status_code}: {resp.text[:300]}")
-    return resp.json()
+def proxies_for(proxy_url):
+    """curl_cffi proxies mapping for `proxy_url` — build once, pass to every request."""
+    return {"http": proxy_url, "https": proxy_url} if proxy_url else None
+
+
+def _search_page_fast(session, url, headers, payload, cursor, proxies=None):
+    """POST one page using a prebuilt url/headers/payload; sets the cursors in place."""
+    variables = payload["variables"]
+    variables["staysMapSearchRequestV2"]["cursor"] = cursor
+    variables["staysSearchRequest"]["cursor"] = cursor
+
+    # HEADERS already carries content-type: application/json
+    resp = session.post(url, data=fastjson.dumps(payload), headers=headers, proxies=proxies)
+    return _decode_search_response(resp.status_code, resp.content)
+
+
+def search_page(api_key, cursor, raw_params, currency, language, op_hash, proxy_url="", headers=None):
+    """
+    Call Airbnb's StaysSearch GraphQL endpoint for one page.
+    Pass `headers` from request_headers(api_key) to skip rebuilding them.
+    """
+    if headers is None:
+        headers = request_headers(api_key)
+    return _search_page_fast(
+        _session, search_url(op_hash, currency, language), headers,
+        search_payload(raw_params, op_hash), cursor, proxies_for(proxy_url),
+    )
+
+
+# curl_cffi sessions aren't thread-safe — give each scan thread its own so
+# it can keep its connection to a0.muscache.com alive across bundles.
+JS_SCAN_WORKERS = 16
+_scan_local = threading.local()
+
+
+def _scan_session():
+    session = getattr(_scan_local, "session", None)
+    if session is None:
+        session = _scan_local.session = cffi_requests.Session(impersonate="chrome124")
+    return session
+
+
+# Static JS bundles don't need the Chrome TLS fingerprint — when httpx with
+# HTTP/2 is available, all scan threads multiplex over one CDN connection.
+# httpx only takes proxies per client, so proxied scans stay on curl_cffi.
+# Built on the first JS scan only; most processes never run one.
+@functools.lru_cache(maxsize=1)
+def _get_h2_client():
+    try:
+        import httpx
+        return httpx.Client(http2=True, headers=_UA_HEADERS, timeout=10)
+    except ImportError:
+        return None
+
+
+def _fetch_and_scan(js_url, headers, proxies, h2_client=None):
+    """Fetch one JS bundle and return the StaysSearch hash in it, or None."""
+    try:
+        if h2_client is not None:
+            r = h2_client.get(js_url)
+        else:
+            r = _scan_session().get(js_url, headers=headers, proxies=proxies, timeout=10)
+        if r.status_code != 200:
+            return None
+        m = _OPID_RE.search(r.text)
+        return m.group(1) if m else None
+    except Exception:
+        return None
 
 
 def fetch_live_hash(proxy_url=""):
@@ -230,43 +452,43 @@ def fetch_live_hash(proxy_url=""):
     Falls back to DEFAULT_HASH if extraction fails.
     """
     try:
-        proxies = {"http": proxy_url, "https": proxy_url} if proxy_url else {}
-        headers = {"User-Agent": HEADERS["User-Agent"]}
+        proxies = proxies_for(proxy_url)
+        headers = _UA_HEADERS
 
         # Use the search page — it loads the StaysSearch operation bundle
-        page = cffi_requests.get(
+        page = _session.get(
             "https://www.airbnb.com/s/homes",
-            headers=headers, proxies=proxies, impersonate="chrome124", timeout=15
+            headers=headers, proxies=proxies, timeout=15
         )
         page.raise_for_status()
 
+        # The operation registry is sometimes inlined in the page itself
+        m = _OPID_RE.search(page.text)
+        if m:
+            found = m.group(1)
+            print(f"DEBUG: live hash found inline on search page: {found[:16]}...")
+            return found
+
         # Collect all unique muscache JS URLs from the page
-        js_urls = list(dict.fromkeys(
-            re.findall(
-                r"https://a0\.muscache\.com/airbnb/static/packages/web/[^\"'\s]+\.js",
-                page.text
-            )
-        ))
+        js_urls = list(dict.fromkeys(_MUSCACHE_RE.findall(page.text)))
         print(f"DEBUG: found {len(js_urls)} JS files on search page")
 
-        # Scan each JS file for the StaysSearch operationId
-        # Pattern: name:'StaysSearch',type:'query',operationId:'<hash>'
-        pattern = re.compile(
-            r"name:['\"]StaysSearch['\"][^}]{0,100}operationId:['\"]([0-9a-f]{64})['\"]" 
-        )
-        for js_url in js_urls:
-            try:
-                r = cffi_requests.get(js_url, headers=headers, proxies=proxies,
-                                      impersonate="chrome124", timeout=10)
-                if r.status_code != 200:
-                    continue
-                m = pattern.search(r.text)
-                if m:
-                    found = m.group(1)
-                    print(f"DEBUG: live hash found in {js_url.split('/')[-1]}: {found[:16]}...")
+        # Scan the JS files concurrently — pure network wait, and only the
+        # first match matters, so cancel whatever hasn't started once found.
+        pool = ThreadPoolExecutor(max_workers=JS_SCAN_WORKERS)
+        try:
+            # Resolved here, before the threads start, so only one client is built
+            h2_client = None if proxies else _get_h2_client()
+            futs = {pool.submit(_fetch_and_scan, js_url, headers, proxies, h2_client): js_url for js_url in js_urls}
+            for fut in as_completed(futs):
+                found = fut.result()
+                if found:
+                    for f in futs:
+                        f.cancel()
+                    print(f"DEBUG: live hash found in {futs[fut].split('/')[-1]}: {found[:16]}...")
                     return found
-            except Exception:
-                continue
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
         print("DEBUG: StaysSearch hash not found in any JS file — using default")
         return DEFAULT_HASH
@@ -276,48 +498,408 @@ def fetch_live_hash(proxy_url=""):
         return DEFAULT_HASH
 
 
-# Cache the hash at module load time so we only fetch it once per process
+# Cache the hash in memory and on disk, both for HASH_CACHE_TTL, so a long-lived
+# worker picks up a rotated hash and restarts within the TTL skip the JS scan.
+# The DEFAULT_HASH fallback is never cached — a failed scan is retried, at most
+# once per HASH_RETRY_INTERVAL.
+HASH_CACHE_FILE = os.path.expanduser("~/.cache/airbnb-alerts/opid")
+HASH_CACHE_TTL = 24 * 3600
+HASH_RETRY_INTERVAL = 5 * 60
 _cached_hash = None
+_cached_hash_ts = 0.0
+_hash_failed_at = None
+_hash_lock = threading.Lock()
+
+
+def _read_hash_cache():
+    """(hash, written_at) from the disk cache, or None when missing/stale."""
+    try:
+        written_at = os.path.getmtime(HASH_CACHE_FILE)
+        if time.time() - written_at > HASH_CACHE_TTL:
+            return None
+        with open(HASH_CACHE_FILE) as f:
+            found = f.read().strip()
+        return (found, written_at) if re.fullmatch(r"[0-9a-f]{64}", found) else None
+    except OSError:
+        return None
+
+
+def _write_hash_cache(found):
+    try:
+        os.makedirs(os.path.dirname(HASH_CACHE_FILE), exist_ok=True)
+        with open(HASH_CACHE_FILE, "w") as f:
+            f.write(found)
+    except OSError as e:
+        print(f"DEBUG: could not persist op hash ({e})")
+
 
 def get_op_hash(proxy_url=""):
-    global _cached_hash
-    if _cached_hash is None:
-        _cached_hash = fetch_live_hash(proxy_url)
-    return _cached_hash
+    global _cached_hash, _cached_hash_ts, _hash_failed_at
+    with _hash_lock:
+        now = time.time()
+        if _cached_hash is not None and now - _cached_hash_ts < HASH_CACHE_TTL:
+            return _cached_hash
+        _cached_hash = None
+        stored = _read_hash_cache()
+        if stored is not None:
+            _cached_hash, _cached_hash_ts = stored
+            return _cached_hash
+        if _hash_failed_at is not None and now - _hash_failed_at < HASH_RETRY_INTERVAL:
+            return DEFAULT_HASH
+        found = fetch_live_hash(proxy_url)
+        if found == DEFAULT_HASH:
+            _hash_failed_at = now
+            return found
+        _hash_failed_at = None
+        _cached_hash, _cached_hash_ts = found, now
+        _write_hash_cache(found)
+        return found
+
+
+def invalidate_op_hash(stale_hash):
+    """Drop `stale_hash` from both caches so the next get_op_hash() rescans.
+
+    A no-op when another caller already replaced it, so concurrent pages that
+    all hit the same rejection trigger only one rescan.
+    """
+    global _cached_hash, _hash_failed_at
+    with _hash_lock:
+        if _cached_hash not in (None, stale_hash):
+            return
+        _cached_hash = None
+        # Rejected outright — don't let the retry backoff pin it either
+        _hash_failed_at = None
+        stored = _read_hash_cache()
+        if stored is not None and stored[0] == stale_hash:
+            try:
+                os.remove(HASH_CACHE_FILE)
+            except OSError as e:
+                print(f"DEBUG: could not remove stale op hash ({e})")
+
+
+# The public API key rotates on the order of days — cache it per proxy so
+# every search doesn't pay an extra page fetch just to scrape it again. The
+# on-disk copy lets short-lived scripts and worker restarts reuse it too.
+API_KEY_TTL = 3600
+_api_key_cache = {}
+
 
+def _api_key_disk_key(proxy_url):
+    # Keyed by digest so proxy credentials never land in the cache file
+    return "apikey:" + hashlib.blake2b(proxy_url.encode(), digest_size=8).hexdigest()
+
+
+def get_api_key_cached(proxy_url="", ttl=API_KEY_TTL):
+    now = time.monotonic()
+    hit = _api_key_cache.get(proxy_url)
+    if hit and now - hit[0] < ttl:
+        return hit[1]
+    stored = _cache.get(_api_key_disk_key(proxy_url), ttl)
+    if stored:
+        api_key = stored.decode()
+    else:
+        api_key = get_api_key(proxy_url)
+        _cache.put(_api_key_disk_key(proxy_url), api_key.encode())
+    _api_key_cache[proxy_url] = (now, api_key)
+    return api_key
 
-def search_from_url(url, currency="USD", language="en", proxy_url="", op_hash=None):
+
+def invalidate_api_key(proxy_url=""):
+    _api_key_cache.pop(proxy_url, None)
+    # An empty value reads as a miss in get_api_key_cached()
+    _cache.put(_api_key_disk_key(proxy_url), b"")
+
+
+_PAGINATION_PATH = ("data", "presentation", "staysSearch", "results", "paginationInfo")
+
+def _pagination_info(data):
+    """data.presentation.staysSearch.results.paginationInfo, or {}"""
+    node = data
+    for key in _PAGINATION_PATH:
+        node = node.get(key) if isinstance(node, dict) else None
+        if not node:
+            return {}
+    return node
+
+
+_SEARCH_RESULTS_PATH = ("data", "presentation", "staysSearch", "results", "searchResults")
+
+def extract_ids_from_search(data):
+    """
+    Listing ids from one StaysSearch page without running standardize.
+    Handles both `listing.id` and the newer `demandStayListing.id`, which is
+    base64 of "DemandStayListing:<id>".
+    """
+    node = data
+    for key in _SEARCH_RESULTS_PATH:
+        node = node.get(key) if isinstance(node, dict) else None
+    ids = []
+    for r in node or ():
+        if not isinstance(r, dict):
+            continue
+        lid = (r.get("listing") or {}).get("id")
+        if lid is None:
+            lid = (r.get("demandStayListing") or {}).get("id")
+            if isinstance(lid, str) and not lid.isdigit():
+                try:
+                    lid = base64.b64decode(lid).decode().rpartition(":")[2]
+                except Exception:
+                    pass
+        if lid is not None:
+            ids.append(str(lid))
+    return ids
+
+
+class _SearchAuth:
+    """
+    The API key and op hash one search_from_url() call sends, with their
+    derived headers and endpoint. Page fetches may run on several threads, so
+    a rejected key or hash is refreshed once under the lock: a thread whose
+    stale value was already replaced just picks up the new one.
+    """
+
+    def __init__(self, proxy_url, currency, language, op_hash):
+        self.proxy_url = proxy_url
+        self.currency = currency
+        self.language = language
+        self._lock = threading.Lock()
+        api_key = get_api_key_cached(proxy_url)
+        self._values = (api_key, request_headers(api_key), op_hash,
+                        search_url(op_hash, currency, language))
+
+    def current(self):
+        """(api_key, headers, op_hash, endpoint) to send the next request with."""
+        return self._values
+
+    def refresh_op_hash(self, stale_hash):
+        with self._lock:
+            api_key, headers, op_hash, endpoint = self._values
+            if op_hash == stale_hash:
+                invalidate_op_hash(op_hash)
+                op_hash = get_op_hash(self.proxy_url)
+                endpoint = search_url(op_hash, self.currency, self.language)
+                self._values = (api_key, headers, op_hash, endpoint)
+            return self._values
+
+    def refresh_api_key(self, stale_key):
+        with self._lock:
+            api_key, headers, op_hash, endpoint = self._values
+            if api_key == stale_key:
+                invalidate_api_key(self.proxy_url)
+                api_key = get_api_key_cached(self.proxy_url)
+                self._values = (api_key, request_headers(api_key), op_hash, endpoint)
+            return self._values
+
+
+def search_from_url(url, currency="USD", language="en", proxy_url="", op_hash=None, ids_only=False,
+                    page_workers=1):
     """
     Full paginated search using the original Airbnb URL.
     Correctly extracts placeId, query, ib, guest_favorite, amenities etc.
-    Returns raw listing dicts from pyairbnb's standardize module.
+    Returns raw listing dicts from pyairbnb's standardize module, or just
+    the listing id strings when ids_only=True (skips standardize entirely).
+
+    With page_workers > 1, and when page 1 lists further page cursors
+    (paginationInfo.pageCursors), those pages are fetched concurrently
+    instead of following nextPageCursor one by one; anything past the last
+    listed cursor is then followed sequentially as usual.
     """
-    import pyairbnb.standardize as standardize
-    import pyairbnb.utils as utils
+    if ids_only:
+        parse = extract_ids_from_search
+    else:
+        import pyairbnb.standardize as standardize
+        parse = standardize.from_search
 
     if not op_hash:
         op_hash = get_op_hash(proxy_url)
 
-    qs = parse_qs(urlparse(url).query)
-    raw_params = build_raw_params(qs)
+    raw_params = raw_params_for_query(urlparse(url).query)
+
+    auth = _SearchAuth(proxy_url, currency, language, op_hash)
+    payload = search_payload(raw_params, op_hash)
+    proxies = proxies_for(proxy_url)
+    all_results = []
+    page = 0
+
+    def fetch(cursor, page_no, session=_session, body=payload):
+        api_key, headers, used_hash, endpoint = auth.current()
+        body["extensions"]["persistedQuery"]["sha256Hash"] = used_hash
+        try:
+            return _search_page_fast(session, endpoint, headers, body, cursor, proxies)
+        except StaleOpHashError:
+            # Airbnb rotated the persisted query — rescan for the new hash and retry this page once
+            print(f"DEBUG: op hash {used_hash[:16]}... rejected on page {page_no} — refreshing")
+            api_key, headers, used_hash, endpoint = auth.refresh_op_hash(used_hash)
+            body["extensions"]["persistedQuery"]["sha256Hash"] = used_hash
+            return _search_page_fast(session, endpoint, headers, body, cursor, proxies)
+        except SearchHTTPError as e:
+            if e.status_code not in (401, 403):
+                raise
+            # Cached key was rotated — fetch a fresh one and retry this page once
+            print(f"DEBUG: HTTP {e.status_code} on page {page_no} — refreshing API key")
+            api_key, headers, used_hash, endpoint = auth.refresh_api_key(api_key)
+            return _search_page_fast(session, endpoint, headers, body, cursor, proxies)
+
+    data = fetch("", 1)
+
+    cursors = _pagination_info(data).get("pageCursors") or []
+    if page_workers > 1 and len(cursors) > 1:
+        # curl_cffi sessions aren't thread-safe and payloads are mutated per
+        # request, so each pool thread gets its own of both. The sessions live
+        # only for this call and are closed once its pages are in.
+        local = threading.local()
+        sessions = []
+
+        def fetch_page(page_no, cursor):
+            session = getattr(local, "session", None)
+            if session is None:
+                session = local.session = cffi_requests.Session(impersonate="chrome124")
+                sessions.append(session)
+            return fetch(cursor, page_no, session, search_payload(raw_params, op_hash))
+
+        # pageCursors[0] is page 1, which we already have
+        try:
+            with ThreadPoolExecutor(max_workers=page_workers) as pool:
+                pages = [data] + list(pool.map(fetch_page, range(2, len(cursors) + 1), cursors[1:]))
+                print(f"DEBUG: fetched {len(pages)} pages with {page_workers} workers")
+                for results in pool.map(parse, pages):
+                    if not results:
+                        return all_results
+                    all_results.extend(results)
+                    page += 1
+        finally:
+            for session in sessions:
+                session.close()
+
+        # pageCursors can be a window rather than the full list — carry on
+        # sequentially from the last page's own next cursor, if it has one
+        next_cursor = _pagination_info(pages[-1]).get("nextPageCursor")
+        if not next_cursor or next_cursor in cursors:
+            return all_results
+        print(f"DEBUG: pageCursors stopped at page {page} — following nextPageCursor")
+        data = fetch(next_cursor, page + 1)
+
+    # The next cursor is known before the page is parsed, so standardize
+    # page N on a worker thread while page N+1 is in flight.
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        while True:
+            page += 1
+            next_cursor = _pagination_info(data).get("nextPageCursor")
+            parsed = pool.submit(parse, data)
+            next_data = fetch(next_cursor, page + 1) if next_cursor else None
+
+            results = parsed.result()
+            all_results.extend(results)
+            if not results or next_data is None:
+                break
+            data = next_data
+    finally:
+        pool.shutdown()
+
+    return all_results
+
+
+async def _search_page_async(session, url, headers, payload, cursor, proxies=None):
+    """Async twin of _search_page_fast for curl_cffi's AsyncSession."""
+    variables = payload["variables"]
+    variables["staysMapSearchRequestV2"]["cursor"] = cursor
+    variables["staysSearchRequest"]["cursor"] = cursor
+
+    resp = await session.post(url, data=fastjson.dumps(payload), headers=headers, proxies=proxies)
+    return _decode_search_response(resp.status_code, resp.content)
+
+
+async def search_from_url_async(url, session, currency="USD", language="en", proxy_url="",
+                                op_hash=None, ids_only=False, api_key=None):
+    """
+    search_from_url() on an event loop. Pages are still fetched in order for
+    one URL, but many URLs can share one loop and one AsyncSession — see
+    search_many_from_urls(), which also resolves op_hash and api_key once for
+    all of them.
+    """
+    if ids_only:
+        parse = extract_ids_from_search
+    else:
+        import pyairbnb.standardize as standardize
+        parse = standardize.from_search
 
-    api_key = get_api_key(proxy_url)
+    # First calls may hit the network; keep them off the event loop
+    if not op_hash:
+        op_hash = await asyncio.to_thread(get_op_hash, proxy_url)
+    if not api_key:
+        api_key = await asyncio.to_thread(get_api_key_cached, proxy_url)
+
+    raw_params = raw_params_for_query(urlparse(url).query)
+    headers = request_headers(api_key)
+    endpoint = search_url(op_hash, currency, language)
+    payload = search_payload(raw_params, op_hash)
+    proxies = proxies_for(proxy_url)
     all_results = []
-    cursor = ""
     page = 0
 
+    async def fetch(cursor):
+        nonlocal api_key, headers, op_hash, endpoint
+        try:
+            return await _search_page_async(session, endpoint, headers, payload, cursor, proxies)
+        except StaleOpHashError:
+            print(f"DEBUG: op hash {op_hash[:16]}... rejected on page {page + 1} — refreshing")
+            invalidate_op_hash(op_hash)
+            op_hash = await asyncio.to_thread(get_op_hash, proxy_url)
+            endpoint = search_url(op_hash, currency, language)
+            payload["extensions"]["persistedQuery"]["sha256Hash"] = op_hash
+            return await _search_page_async(session, endpoint, headers, payload, cursor, proxies)
+        except SearchHTTPError as e:
+            if e.status_code not in (401, 403):
+                raise
+            print(f"DEBUG: HTTP {e.status_code} on page {page + 1} — refreshing API key")
+            invalidate_api_key(proxy_url)
+            api_key = await asyncio.to_thread(get_api_key_cached, proxy_url)
+            headers = request_headers(api_key)
+            return await _search_page_async(session, endpoint, headers, payload, cursor, proxies)
+
+    data = await fetch("")
     while True:
         page += 1
-        data = search_page(api_key, cursor, raw_params, currency, language, op_hash, proxy_url)
-        results = standardize.from_search(data)
-        pagination = utils.get_nested_value(
-            data, "data.presentation.staysSearch.results.paginationInfo", {}
-        )
+        next_cursor = _pagination_info(data).get("nextPageCursor")
+        parsed = asyncio.ensure_future(asyncio.to_thread(parse, data))
+        try:
+            next_data = await fetch(next_cursor) if next_cursor else None
+        except BaseException:
+            # Don't leave the parse of this page dangling when the next fetch fails
+            parsed.cancel()
+            raise
+
+        results = await parsed
         all_results.extend(results)
-
-        next_cursor = pagination.get("nextPageCursor")
-        if not results or not next_cursor:
+        if not results or next_data is None:
             break
-        cursor = next_cursor
+        data = next_data
 
     return all_results
+
+
+async def search_many_from_urls_async(urls, max_connections=32, **kwargs):
+    """
+    Run search_from_url_async for every URL concurrently over one shared
+    AsyncSession. Returns one entry per URL, in order — a result list, or
+    the exception that search raised.
+    """
+    # Resolve these once up front: on a cold cache every URL would otherwise
+    # start its own JS-bundle scan and API key scrape
+    proxy_url = kwargs.get("proxy_url", "")
+    if not kwargs.get("op_hash"):
+        kwargs["op_hash"] = await asyncio.to_thread(get_op_hash, proxy_url)
+    if not kwargs.get("api_key"):
+        kwargs["api_key"] = await asyncio.to_thread(get_api_key_cached, proxy_url)
+
+    async with cffi_requests.AsyncSession(impersonate="chrome124", max_clients=max_connections) as session:
+        return await asyncio.gather(
+            *(search_from_url_async(u, session, **kwargs) for u in urls),
+            return_exceptions=True,
+        )
+
+
+def search_many_from_urls(urls, **kwargs):
+    """Blocking wrapper around search_many_from_urls_async()."""
+    return asyncio.run(search_many_from_urls_async(urls, **kwargs))
@@ -0,0 +1,30 @@
+"""
+JSON encode/decode helpers — orjson when installed, stdlib json otherwise.
+
+dumps() always returns UTF-8 bytes (compact unless indent=True) and loads()
+accepts bytes or str, so callers can write straight to binary files / pipes
+either way. `default` is called for objects JSON can't encode, as in json.
+"""
+
+try:
+    import orjson
+
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj, default=None, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+
+except ImportError:
+    import json
+
+    def loads(data):
+        return json.loads(data)
+
+    def dumps(obj, default=None, indent=False):
+        if indent:
+            return json.dumps(obj, default=default, indent=2).encode("utf-8")
+        return json.dumps(obj, default=default, separators=(",", ":")).encode("utf-8")
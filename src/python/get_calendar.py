@@ -5,19 +5,29 @@ Usage: python get_calendar.py <input_json_file> <output_json_file>
 """
 
 import sys
-import json
-import pyairbnb
+import fastjson
+import _cache
+
+# Availability moves faster than listing details — keep calendars briefly
+CALENDAR_CACHE_TTL = 15 * 60
 
 def get_calendar(listing_id, proxy_url=''):
     """Get calendar/availability for a specific listing"""
+    cache_key = f"cal:{listing_id}"
+    cached = _cache.get(cache_key, CALENDAR_CACHE_TTL)
+    if cached is not None:
+        return fastjson.loads(cached)
+
     try:
+        # Deferred: the import is slow and cache hits / bad input never need it
+        import pyairbnb
         data = pyairbnb.get_calendar(
             room_id=listing_id,
             currency='USD',
             proxy_url=proxy_url
         )
         
-        return {
+        result = {
             'listing_id': listing_id,
             'calendar': data
         }
@@ -25,6 +35,13 @@ def get_calendar(listing_id, proxy_url=''):
     except Exception as e:
         raise Exception(f"Get calendar error: {str(e)}")
 
+    # Like _cache's own failures, a result that won't encode is just not cached
+    try:
+        _cache.put(cache_key, fastjson.dumps(result))
+    except Exception as e:
+        print(f"DEBUG: not caching {cache_key} ({e})")
+    return result
+
 def main():
     if len(sys.argv) != 3:
         print("Usage: python get_calendar.py <input_file> <output_file>")
@@ -35,18 +52,16 @@ def main():
     
     try:
         # Read input parameters
-        with open(input_file, 'r') as f:
-            params = json.load(f)
-        
-        listing_id = params.get('listing_id')
-        proxy_url = params.get('proxy_url', '')
+        with open(input_file, 'rb') as f:
+            params = fastjson.loads(f.read())
         
-        # Get calendar
-        result = get_calendar(listing_id, proxy_url)
+        # Get calendar (same code path as the persistent worker)
+        from worker import dispatch
+        result = dispatch('get_calendar', params)
         
         # Write results
-        with open(output_file, 'w') as f:
-            json.dump(result, f)
+        with open(output_file, 'wb') as f:
+            f.write(fastjson.dumps(result))
         
         sys.exit(0)
     
@@ -55,8 +70,8 @@ def main():
             'error': str(e),
             'calendar': None
         }
-        with open(output_file, 'w') as f:
-            json.dump(error_output, f)
+        with open(output_file, 'wb') as f:
+            f.write(fastjson.dumps(error_output))
         sys.exit(1)
 
 if __name__ == '__main__':
@@ -5,19 +5,29 @@ Usage: python get_listing.py <input_json_file> <output_json_file>
 """
 
 import sys
-import json
-import pyairbnb
+import fastjson
+import _cache
+
+# Listing details change rarely — serve repeat lookups from disk for a while
+LISTING_CACHE_TTL = 6 * 3600
 
 def get_listing_details(listing_id, currency='USD', proxy_url=''):
     """Get detailed information for a specific listing"""
+    cache_key = f"listing:{listing_id}:{currency}"
+    cached = _cache.get(cache_key, LISTING_CACHE_TTL)
+    if cached is not None:
+        return fastjson.loads(cached)
+
     try:
+        # Deferred: the import is slow and cache hits / bad input never need it
+        import pyairbnb
         data = pyairbnb.get_details(
             room_id=listing_id,
             currency=currency,
             proxy_url=proxy_url
         )
         
-        return {
+        result = {
             'id': listing_id,
             'name': data.get('name'),
             'description': data.get('description'),
@@ -43,6 +53,13 @@ def get_listing_details(listing_id, currency='USD', proxy_url=''):
     except Exception as e:
         raise Exception(f"Get listing error: {str(e)}")
 
+    # Like _cache's own failures, a result that won't encode is just not cached
+    try:
+        _cache.put(cache_key, fastjson.dumps(result))
+    except Exception as e:
+        print(f"DEBUG: not caching {cache_key} ({e})")
+    return result
+
 def main():
     if len(sys.argv) != 3:
         print("Usage: python get_listing.py <input_file> <output_file>")
@@ -53,19 +70,16 @@ def main():
     
     try:
         # Read input parameters
-        with open(input_file, 'r') as f:
-            params = json.load(f)
-        
-        listing_id = params.get('listing_id')
-        currency = params.get('currency', 'USD')
-        proxy_url = params.get('proxy_url', '')
+        with open(input_file, 'rb') as f:
+            params = fastjson.loads(f.read())
         
-        # Get listing details
-        result = get_listing_details(listing_id, currency, proxy_url)
+        # Get listing details (same code path as the persistent worker)
+        from worker import dispatch
+        result = dispatch('get_listing', params)
         
         # Write results
-        with open(output_file, 'w') as f:
-            json.dump(result, f)
+        with open(output_file, 'wb') as f:
+            f.write(fastjson.dumps(result))
         
         sys.exit(0)
     
@@ -74,8 +88,8 @@ def main():
             'error': str(e),
             'listing': None
         }
-        with open(output_file, 'w') as f:
-            json.dump(error_output, f)
+        with open(output_file, 'wb') as f:
+            f.write(fastjson.dumps(error_output))
         sys.exit(1)
 
 if __name__ == '__main__':
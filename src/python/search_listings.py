@@ -2,20 +2,302 @@
 """
 Search Airbnb listings using pyairbnb library
 Usage: python search_listings.py <input_json_file> <output_json_file>
+       python search_listings.py --server   (same as worker.py)
 """
 
 import sys
-import json
+from sys import intern
 import re
 import os
-import pyairbnb
+import hashlib
+import functools
 
 # Ensure src/python is on the path regardless of working directory
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from airbnb_search import search_from_url
+import fastjson
+import _cache
+
+# Search results are stable over short windows; absorbs retries and repeat
+# runs of the same alert. Pass no_cache=true in params to bypass.
+SEARCH_CACHE_TTL = 5 * 60
+
+# Pages of a URL search fetched at once when page 1 lists every cursor. 1
+# keeps pagination sequential; pass page_workers in params to opt in.
+SEARCH_PAGE_WORKERS = 1
+
+# Compiled once — these run per listing in the filter and normalise loops.
+# The text patterns are matched against pre-lowercased text (_lower_text),
+# so they don't need IGNORECASE.
+_MONTHLY_RE    = re.compile(r'\b(month|monthly|long[- ]stay)\b')
+_HOME_RE       = re.compile(r'\b(entire|home|house|apt|apartment|studio)\b')
+# Badge markers we care about, found in one scan over the uppercased badges
+_BADGE_FLAG_RE = re.compile(r'GUEST_FAVORITE|INSTANT')
+_BED_NUM_RE    = re.compile(r'(\d+)')
+
+
+def _extract_superhost(listing):
+    flag = listing.get('hostIsSuperhost')
+    if flag is None:
+        flag = listing.get('host_is_superhost')
+    if flag:
+        return flag
+    host = listing.get('host')
+    return isinstance(host, dict) and host.get('is_superhost')
+
+
+def _extract_beds(s):
+    """First integer followed by optional whitespace and 'bed' (any case),
+    or None — same match as re.search(r'(\\d+)\\s*bed', s, re.I) without
+    the regex engine. '2 bedrooms · 3 beds' -> 2."""
+    i, n = 0, len(s)
+    while i < n:
+        if not s[i].isdecimal():
+            i += 1
+            continue
+        j = i + 1
+        while j < n and s[j].isdecimal():
+            j += 1
+        k = j
+        while k < n and s[k].isspace():
+            k += 1
+        if s[k:k + 3].lower() == 'bed':
+            return int(s[i:j])
+        i = j
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_search_all():
+    """pyairbnb.search_all, imported on first use — only the no-URL fallback
+    needs pyairbnb at all, and the worker resolves it once."""
+    from pyairbnb import search_all
+    return search_all
+
+
+def _upper_badges(badges):
+    """Uppercase every badge once so the per-check scans are plain `in` tests."""
+    return tuple(str(b).upper() for b in badges)
+
+
+def _badge_flags(badges_upper):
+    """Which of GUEST_FAVORITE / INSTANT appear in any badge (substring match,
+    so TOP_X_GUEST_FAVORITE counts)."""
+    if not badges_upper:
+        return frozenset()
+    return frozenset(_BADGE_FLAG_RE.findall('\n'.join(badges_upper)))
+
+
+def _lower_text(item):
+    """name / title / summary, lowercased and newline-joined (so no pattern
+    can match across two fields)."""
+    return '\n'.join(t.lower() for t in (item.get('name'), item.get('title'), item.get('summary'))
+                     if t and isinstance(t, str))
+
+
+def _structured_mentions_home(sc):
+    for arr_key in ('primaryLine', 'mapPrimaryLine', 'secondaryLine', 'mapSecondaryLine'):
+        for entry in (sc.get(arr_key) or []):
+            body = (entry.get('body') if isinstance(entry, dict) else str(entry)) or ''
+            if isinstance(body, str) and _HOME_RE.search(body.lower()):
+                return True
+    return False
+
+
+def _detect_is_home(item, badges, badges_upper, text_lower):
+    # Cheapest signals first; the structuredContent scan only runs when
+    # nothing else matched
+    rt = item.get('roomType') or item.get('type') or ''
+    rt = rt.lower() if isinstance(rt, str) else ''
+    return bool(
+        item.get('entire_place') or item.get('is_entire_place') or
+        any(isinstance(b, str) and ('HOME' in u or 'ENTIRE' in u) for b, u in zip(badges, badges_upper)) or
+        'entire' in rt or 'home' in rt or
+        _HOME_RE.search(text_lower) or
+        _structured_mentions_home(item.get('structuredContent') or {})
+    )
+
+
+def normalize_listing(listing, currency):
+    """Map one raw pyairbnb / search_from_url result onto the listing shape
+    the Node side stores."""
+    get = listing.get
+    # Each field takes its first alias that isn't None — a falsy value such
+    # as id=0 or name='' still wins over the next alias
+    raw_id = None
+    for key in ('id', 'room_id', 'roomId', 'listingId'):
+        raw_id = get(key)
+        if raw_id is not None:
+            break
+    try:
+        listing_id = str(int(raw_id)) if raw_id is not None else None
+    except Exception:
+        listing_id = str(raw_id) if raw_id is not None else None
+
+    price = get('price')
+    if price is None:
+        price = get('price_total')
+        if price is None:
+            price = get('priceValue')
+    photos = get('photos')
+    if photos is None:
+        photos = get('images')
+    photos = photos or []
+
+    # rating may be a plain number OR a dict like {'value': 4.87, 'reviewCount': '162'}
+    raw_rating = get('rating')
+    if raw_rating is None:
+        raw_rating = get('stars')
+        if raw_rating is None:
+            raw_rating = get('score')
+    if isinstance(raw_rating, dict):
+        rating_value = raw_rating.get('value')
+        review_count_from_rating = raw_rating.get('reviewCount')
+    else:
+        rating_value = raw_rating
+        review_count_from_rating = None
+
+    guests = get('guests')
+    if guests is None:
+        guests = get('person_capacity')
+
+    lat = lng = None
+    loc = get('location')
+    if loc is None:
+        loc = get('coordinates')
+    loc = loc or {}
+    if isinstance(loc, dict):
+        lat = loc.get('lat') or loc.get('latitude')
+        lng = loc.get('lng') or loc.get('longitude')
+
+    # Room types, badges and the currency come from small fixed vocabularies
+    # repeated across every listing — intern them so each is stored once.
+    # Free text (name, title, url, address) is left alone.
+    # Badges keep whatever shape pyairbnb returned; only a list's entries are
+    # swapped for their interned copies.
+    badges = get('badges') or []
+    if isinstance(badges, list):
+        badges = [intern(b) if isinstance(b, str) else b for b in badges]
+    room_type = get('roomType')
+    if room_type is None:
+        room_type = get('type')
+    if isinstance(room_type, str):
+        room_type = intern(room_type)
+    structured = listing.get('structuredContent') or {}
+
+    bedrooms = beds = None
+    try:
+        for entry in (structured.get('mapPrimaryLine') or []):
+            if isinstance(entry, dict) and entry.get('type') == 'BEDINFO':
+                m = _BED_NUM_RE.search(entry.get('body') or '')
+                if m:
+                    beds = int(m.group(1))
+                    bedrooms = beds
+                    break
+    except Exception:
+        pass
+
+    badges_upper = _upper_badges(badges)
+    badge_flags = _badge_flags(badges_upper)
+    is_guest_favorite = bool(
+        listing.get('is_guest_favorite') or
+        listing.get('isGuestFavorite') or
+        'GUEST_FAVORITE' in badge_flags
+    )
+    instant_book = bool(
+        listing.get('ib') or listing.get('instant_book') or
+        listing.get('is_instant_bookable') or listing.get('isInstantBookable') or
+        'INSTANT' in badge_flags
+    )
+
+    reviews_count = get('reviewsCount')
+    if reviews_count is None:
+        reviews_count = get('review_count')
+
+    return {
+        'id':             listing_id,
+        'url':            v if (v := get('url')) is not None else get('listing_url'),
+        'name':           v if (v := get('name')) is not None else get('title'),
+        'price':          price,
+        'currency':       currency,
+        'rating':         rating_value,
+        'reviewsCount':   reviews_count or review_count_from_rating or 0,
+        'roomType':       room_type,
+        'guests':         guests,
+        'address':        v if (v := get('address')) is not None else get('location_address'),
+        'lat':            lat,
+        'lng':            lng,
+        'hostId':         v if (v := get('hostId')) is not None else get('host_id'),
+        'hostName':       v if (v := get('hostName')) is not None else get('host_name'),
+        'hostIsSuperhost': _extract_superhost(listing),
+        'photos':         photos,
+        'badges':         badges,
+        'isGuestFavorite': is_guest_favorite,
+        'instantBook':    instant_book,
+        'isHome':         _detect_is_home(listing, badges, badges_upper, _lower_text(listing)),
+        'bedrooms':       bedrooms,
+        'beds':           beds,
+    }
+
+
+def _iter_normalized(results, currency):
+    """Yield one normalised listing dict per raw result, in order."""
+    # Shared by every listing in the batch (see the interning note in
+    # normalize_listing)
+    if isinstance(currency, str):
+        currency = intern(currency)
+    for listing in results:
+        yield normalize_listing(listing, currency)
+
 
 def search_listings(params):
     """Search Airbnb listings with given parameters"""
+    return list(iter_search_listings(params))
+
+
+def _search_cache_key(params):
+    key_params = sorted((k, v) for k, v in params.items() if k != 'no_cache')
+    digest = hashlib.blake2b(fastjson.dumps(key_params, default=str), digest_size=16).hexdigest()
+    return f"search:{digest}"
+
+
+def _search_error(e):
+    import traceback
+    return Exception(f"Search error: {str(e)}\nTraceback: {traceback.format_exc()}")
+
+
+def _iter_search_errors(items):
+    """Pass `items` through; normalising is lazy, so its failures surface
+    here and get the same "Search error" wrapping as the fetch/filter step."""
+    try:
+        yield from items
+    except Exception as e:
+        raise _search_error(e)
+
+
+def _iter_caching(items, cache_key):
+    """Pass `items` through, storing the full list once it's exhausted."""
+    seen = []
+    for item in items:
+        seen.append(item)
+        yield item
+    # An empty result is as likely a blocked request as a genuinely empty
+    # search — don't pin it for the whole TTL
+    if seen:
+        _cache.put(cache_key, fastjson.dumps(seen))
+
+
+def iter_search_listings(params):
+    """Like search_listings(), but normalises lazily — fetching and filtering
+    happen up front, each listing is normalised as the caller iterates."""
+    use_cache = not params.get('no_cache')
+    if use_cache:
+        cache_key = _search_cache_key(params)
+        cached = _cache.get(cache_key, SEARCH_CACHE_TTL)
+        if cached is not None:
+            print('DEBUG: search cache hit')
+            return iter(fastjson.loads(cached))
+
     try:
         currency = params.get('currency', 'USD')
         proxy_url = params.get('proxy_url', '')
@@ -39,6 +321,7 @@ def search_listings(params):
                 url=search_url,
                 currency=currency,
                 proxy_url=proxy_url,
+                page_workers=int(params.get('page_workers') or SEARCH_PAGE_WORKERS),
             )
             print(f'DEBUG: search_from_url raw_results_count= {len(results) if results else 0}')
 
@@ -79,7 +362,7 @@ def search_listings(params):
             else:
                 zoom = 12
 
-            results = pyairbnb.search_all(
+            results = _get_search_all()(
                 check_in=check_in,
                 check_out=check_out,
                 ne_lat=ne_lat,
@@ -119,6 +402,10 @@ def search_listings(params):
         # ------------------------------------------------------------------ #
         using_url = bool(search_url)
 
+        # Each active filter contributes a predicate; they're applied in one
+        # pass at the end, cheapest first (see the ordering below).
+        preds = {}
+
         # monthly search
         if params.get('monthly_search') or (
             params.get('monthly_start_date') and not (params.get('check_in') and params.get('check_out'))
@@ -132,11 +419,8 @@ def search_listings(params):
                 qualifier = (unit.get('qualifier') or '').lower()
                 if 'month' in qualifier or 'mo' in qualifier:
                     return True
-                for t in (item.get('name') or '', item.get('title') or '', item.get('summary') or ''):
-                    if isinstance(t, str) and re.search(r'\b(month|monthly|long[- ]stay)\b', t, re.I):
-                        return True
-                return False
-            results = [r for r in results if is_monthly(r)]
+                return bool(_MONTHLY_RE.search(_lower_text(item)))
+            preds['monthly'] = is_monthly
         # guest_favorite — Airbnb never enforces this server-side even when
         # sent in rawParams, so always post-filter.
         # Badges to match: GUEST_FAVORITE, TOP_X_GUEST_FAVORITE
@@ -144,26 +428,16 @@ def search_listings(params):
             def is_guest_fav(item):
                 if item.get('is_guest_favorite') or item.get('isGuestFavorite'):
                     return True
-                badges = item.get('badges') or []
-                if any('GUEST_FAVORITE' in str(b).upper() for b in badges):
-                    return True
-                return False
-            before = len(results)
-            results = [r for r in results if is_guest_fav(r)]
-            print(f'DEBUG: guest_favorite filter removed {before - len(results)}, kept {len(results)}')
+                return 'GUEST_FAVORITE' in _badge_flags(_upper_badges(item.get('badges') or ()))
+            preds['guest_favorite'] = is_guest_fav
 
         # instant_book — server-side via URL; only post-filter in fallback mode
         if params.get('instant_book') and not using_url:
             def is_instant(item):
                 if item.get('ib') or item.get('instant_book') or item.get('is_instant_bookable') or item.get('isInstantBookable'):
                     return True
-                badges = item.get('badges') or []
-                if any('INSTANT' in str(b).upper() for b in badges):
-                    return True
-                return False
-            before = len(results)
-            results = [r for r in results if is_instant(r)]
-            print(f'DEBUG: after_instant_book_filter= {len(results)} (removed {before - len(results)})')
+                return 'INSTANT' in _badge_flags(_upper_badges(item.get('badges') or ()))
+            preds['instant_book'] = is_instant
 
         # min_beds — server-side via URL; only post-filter in fallback mode
         want_min_beds = params.get('min_beds') or 0
@@ -178,130 +452,44 @@ def search_listings(params):
                 for arr_key in ('mapPrimaryLine', 'primaryLine'):
                     for entry in (sc.get(arr_key) or []):
                         body = (entry.get('body') if isinstance(entry, dict) else str(entry)) or ''
-                        m = re.search(r'(\d+)\s*bed', str(body), re.I)
-                        if m:
-                            return int(m.group(1)) >= int(want_min_beds)
+                        n = _extract_beds(str(body))
+                        if n is not None:
+                            return n >= int(want_min_beds)
+                return True
+            preds['min_beds'] = meets_min_beds
+
+        if preds:
+            # Flag/badge checks first; the bed and monthly checks fall back
+            # to regex scans, so only run them on listings still in play
+            order = [k for k in ('guest_favorite', 'instant_book', 'min_beds', 'monthly') if k in preds]
+            active = tuple(preds[k] for k in order)
+
+            def keep(item):
+                for pred in active:
+                    if not pred(item):
+                        return False
                 return True
+
             before = len(results)
-            results = [r for r in results if meets_min_beds(r)]
-            print(f'DEBUG: after_min_beds_filter= {len(results)} (removed {before - len(results)})')
+            results = [r for r in results if keep(r)]
+            print(f'DEBUG: post-filters {"+".join(order)} removed {before - len(results)}, kept {len(results)}')
 
         # ------------------------------------------------------------------ #
-        # NORMALISE
+        # NORMALISE — lazily, so the caller can encode as it goes
         # ------------------------------------------------------------------ #
-        formatted_results = []
-        for listing in results:
-            def pick(*keys):
-                for k in keys:
-                    v = listing.get(k)
-                    if v is not None:
-                        return v
-                return None
-
-            raw_id = pick('id', 'room_id', 'roomId', 'listingId')
-            try:
-                listing_id = str(int(raw_id)) if raw_id is not None else None
-            except Exception:
-                listing_id = str(raw_id) if raw_id is not None else None
-
-            price  = pick('price', 'price_total', 'priceValue')
-            photos = pick('photos', 'images') or []
-
-            # rating may be a plain number OR a dict like {'value': 4.87, 'reviewCount': '162'}
-            raw_rating = pick('rating', 'stars', 'score')
-            if isinstance(raw_rating, dict):
-                rating_value = raw_rating.get('value')
-                review_count_from_rating = raw_rating.get('reviewCount')
-            else:
-                rating_value = raw_rating
-                review_count_from_rating = None
-
-            lat = lng = None
-            loc = pick('location', 'coordinates') or {}
-            if isinstance(loc, dict):
-                lat = loc.get('lat') or loc.get('latitude')
-                lng = loc.get('lng') or loc.get('longitude')
-
-            badges = pick('badges') or []
-            structured = listing.get('structuredContent') or {}
-
-            bedrooms = beds = None
-            try:
-                for entry in (structured.get('mapPrimaryLine') or []):
-                    if isinstance(entry, dict) and entry.get('type') == 'BEDINFO':
-                        m = re.search(r'(\d+)', entry.get('body') or '')
-                        if m:
-                            beds = int(m.group(1))
-                            bedrooms = beds
-                            break
-            except Exception:
-                pass
-
-            is_guest_favorite = bool(
-                listing.get('is_guest_favorite') or
-                listing.get('isGuestFavorite') or
-                any('GUEST_FAVORITE' in str(b).upper() for b in badges)
-            )
-            instant_book = bool(
-                listing.get('ib') or listing.get('instant_book') or
-                listing.get('is_instant_bookable') or listing.get('isInstantBookable') or
-                any('INSTANT' in str(b).upper() for b in badges)
-            )
-
-            def detect_is_home(item):
-                if item.get('entire_place') or item.get('is_entire_place'):
-                    return True
-                rt = item.get('roomType') or item.get('type') or ''
-                if isinstance(rt, str) and ('entire' in rt.lower() or 'home' in rt.lower()):
-                    return True
-                for text_key in ('name', 'title', 'summary'):
-                    tx = item.get(text_key) or ''
-                    if isinstance(tx, str) and re.search(r'\b(entire|home|house|apt|apartment|studio)\b', tx, re.I):
-                        return True
-                sc = item.get('structuredContent') or {}
-                for arr_key in ('primaryLine', 'mapPrimaryLine', 'secondaryLine', 'mapSecondaryLine'):
-                    for entry in (sc.get(arr_key) or []):
-                        body = (entry.get('body') if isinstance(entry, dict) else str(entry)) or ''
-                        if isinstance(body, str) and re.search(r'\b(entire|home|house|apt|apartment|studio)\b', body, re.I):
-                            return True
-                return any(isinstance(b, str) and re.search(r'HOME|ENTIRE', b, re.I) for b in badges)
-
-            formatted_results.append({
-                'id':             listing_id,
-                'url':            pick('url', 'listing_url'),
-                'name':           pick('name', 'title'),
-                'price':          price,
-                'currency':       currency,
-                'rating':         rating_value,
-                'reviewsCount':   pick('reviewsCount', 'review_count') or review_count_from_rating or 0,
-                'roomType':       pick('roomType', 'type'),
-                'guests':         pick('guests', 'person_capacity'),
-                'address':        pick('address', 'location_address'),
-                'lat':            lat,
-                'lng':            lng,
-                'hostId':         pick('hostId', 'host_id'),
-                'hostName':       pick('hostName', 'host_name'),
-                'hostIsSuperhost': pick('hostIsSuperhost', 'host_is_superhost') or (
-                    isinstance(listing.get('host'), dict) and
-                    listing['host'].get('is_superhost')
-                ),
-                'photos':         photos,
-                'badges':         badges,
-                'isGuestFavorite': is_guest_favorite,
-                'instantBook':    instant_book,
-                'isHome':         bool(detect_is_home(listing)),
-                'bedrooms':       bedrooms,
-                'beds':           beds,
-            })
-
-        return formatted_results
+        normalized = _iter_normalized(results, currency)
+        return _iter_search_errors(_iter_caching(normalized, cache_key) if use_cache else normalized)
 
     except Exception as e:
-        import traceback
-        raise Exception(f"Search error: {str(e)}\nTraceback: {traceback.format_exc()}")
+        raise _search_error(e)
 
 
 def main():
+    if sys.argv[1:] == ['--server']:
+        import worker
+        worker.main()
+        return
+
     if len(sys.argv) != 3:
         print("Usage: python search_listings.py <input_file> <output_file>")
         sys.exit(1)
@@ -310,19 +498,24 @@ def main():
     output_file = sys.argv[2]
 
     try:
-        with open(input_file, 'r') as f:
-            params = json.load(f)
-
-        results = search_listings(params)
-
-        with open(output_file, 'w') as f:
-            json.dump(results, f)
+        with open(input_file, 'rb') as f:
+            params = fastjson.loads(f.read())
+
+        # Encode listing by listing rather than building the whole list;
+        # on error the except branch below truncates the partial output
+        with open(output_file, 'wb') as f:
+            f.write(b'[')
+            for i, item in enumerate(iter_search_listings(params)):
+                if i:
+                    f.write(b',')
+                f.write(fastjson.dumps(item))
+            f.write(b']')
 
         sys.exit(0)
 
     except Exception as e:
-        with open(output_file, 'w') as f:
-            json.dump({'error': str(e), 'results': []}, f)
+        with open(output_file, 'wb') as f:
+            f.write(fastjson.dumps({'error': str(e), 'results': []}))
         sys.exit(1)
 
 
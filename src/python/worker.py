@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Long-lived Airbnb scraper worker.
+Usage: python worker.py
+
+Imports pyairbnb and the search helpers once, then serves requests from the
+Node side over stdin/stdout so each call skips interpreter startup and the
+heavy pyairbnb import. Requests are handled one at a time; python-executor.js
+runs a small pool of these (PYTHON_WORKERS) and kills one that overruns
+PYTHON_WORKER_TIMEOUT_MS.
+
+Framing (both directions): 4-byte big-endian length + UTF-8 JSON payload
+(orjson when installed).
+  request:  {"id": 7, "op": "search", "params": {...}}
+  response: {"id": 7, "result": ...}  or  {"id": 7, "error": "..."}
+
+`id` is an opaque correlation id chosen by the caller and echoed back as-is.
+
+Supported ops: get_calendar, get_listing, search, search_from_url.
+All DEBUG print() output is redirected to stderr so stdout carries frames only.
+"""
+
+import sys
+import os
+
+# Ensure src/python is on the path regardless of working directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fastjson
+
+
+def _get_calendar(params):
+    from get_calendar import get_calendar
+    return get_calendar(params.get('listing_id'), params.get('proxy_url', ''))
+
+
+def _get_listing(params):
+    from get_listing import get_listing_details
+    return get_listing_details(
+        params.get('listing_id'),
+        params.get('currency', 'USD'),
+        params.get('proxy_url', ''),
+    )
+
+
+def _search(params):
+    from search_listings import search_listings
+    return search_listings(params)
+
+
+def _search_from_url(params):
+    from airbnb_search import search_from_url
+    return search_from_url(
+        url=params.get('search_url') or params.get('url'),
+        currency=params.get('currency', 'USD'),
+        language=params.get('language', 'en'),
+        proxy_url=params.get('proxy_url', ''),
+        ids_only=bool(params.get('ids_only')),
+    )
+
+
+OPS = {
+    'get_calendar':    _get_calendar,
+    'get_listing':     _get_listing,
+    'search':          _search,
+    'search_from_url': _search_from_url,
+}
+
+
+def dispatch(op, params):
+    """Run a single operation by name — shared by the worker loop and the CLI scripts."""
+    handler = OPS.get(op)
+    if handler is None:
+        raise Exception(f"Unknown op: {op}")
+    return handler(params or {})
+
+
+def read_frame(stream):
+    """Read one length-prefixed frame. Returns None on EOF."""
+    header = stream.read(4)
+    if len(header) < 4:
+        return None
+    length = int.from_bytes(header, 'big')
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return payload
+
+
+def write_frame(stream, obj):
+    payload = fastjson.dumps(obj)
+    stream.write(len(payload).to_bytes(4, 'big'))
+    stream.write(payload)
+    stream.flush()
+
+
+def serve(stdin, stdout):
+    """Answer framed requests until stdin is closed."""
+    while True:
+        frame = read_frame(stdin)
+        if frame is None:
+            break
+        req_id = None
+        try:
+            req = fastjson.loads(frame)
+            req_id = req.get('id')
+            resp = {'result': dispatch(req.get('op'), req.get('params'))}
+        except Exception as e:
+            resp = {'error': str(e)}
+        if req_id is not None:
+            resp['id'] = req_id
+        write_frame(stdout, resp)
+
+
+def main():
+    # Keep the real stdout for frames; everything printed goes to stderr
+    out = sys.stdout.buffer
+    sys.stdout = sys.stderr
+
+    # Pay the heavy import once, up front
+    import pyairbnb  # noqa: F401
+    import airbnb_search  # noqa: F401
+
+    serve(sys.stdin.buffer, out)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,5 @@
 import { spawn, spawnSync } from 'child_process';
-import { writeFileSync, readFileSync, unlinkSync } from 'fs';
 import { join } from 'path';
-import crypto from 'crypto';
 
 // Resolve a usable python command (check process.env.PYTHON_PATH, then python3, then python)
 function resolvePythonCmd() {
@@ -42,66 +40,157 @@ function checkPythonVersion() {
   }
 }
 
+// ─── Persistent worker pool ──────────────────────────────────────────────────
+// Up to PYTHON_WORKERS long-lived `worker.py` children per Node process. Each
+// child is single-threaded, so a request goes to an idle worker, a new one
+// while the pool has room, or else the least-loaded one. Requests are framed
+// as a 4-byte big-endian length + JSON payload on stdin, responses the same
+// way on stdout. Each request carries an `id` that the worker echoes back,
+// and responses are routed by it rather than by arrival order.
+//
+// A request that takes longer than PYTHON_WORKER_TIMEOUT_MS is rejected and
+// its worker killed; requests queued behind it are resent to the pool.
+const POOL_SIZE = Math.max(1, parseInt(process.env.PYTHON_WORKERS, 10) || 3);
+const REQUEST_TIMEOUT_MS = parseInt(process.env.PYTHON_WORKER_TIMEOUT_MS, 10) || 180000;
+const workers = [];
+let nextRequestId = 1;
+
+function startWorker() {
+  const vcheck = checkPythonVersion();
+  if (!vcheck.ok) {
+    throw new Error(`Python version check failed: ${vcheck.message}`);
+  }
+  const scriptPath = join(process.cwd(), 'src', 'python', 'worker.py');
+  const proc = spawn(vcheck.cmd, [scriptPath]);
+  const state = { proc, pending: new Map(), buffer: Buffer.alloc(0), stderrTail: '' };
+
+  proc.stdout.on('data', (chunk) => {
+    state.buffer = Buffer.concat([state.buffer, chunk]);
+    while (state.buffer.length >= 4) {
+      const length = state.buffer.readUInt32BE(0);
+      if (state.buffer.length < 4 + length) break;
+      const payload = state.buffer.subarray(4, 4 + length);
+      state.buffer = state.buffer.subarray(4 + length);
+
+      let resp;
+      try {
+        resp = JSON.parse(payload.toString('utf-8'));
+      } catch (error) {
+        resp = { error: error.message };
+      }
+      // A frame the worker couldn't parse comes back without an id; it can
+      // only belong to the oldest request still waiting
+      const id = resp.id ?? state.pending.keys().next().value;
+      const next = state.pending.get(id);
+      if (!next) continue;
+      state.pending.delete(id);
+      clearTimeout(next.timer);
+      if (resp.error) next.reject(new Error(resp.error));
+      else next.resolve(resp.result);
+    }
+    if (state.pending.size === 0) idleWorker(state);
+  });
+
+  // Worker DEBUG output goes to stderr — keep only the tail for error reports
+  proc.stderr.on('data', (data) => {
+    state.stderrTail = (state.stderrTail + data.toString()).slice(-4000);
+  });
+
+  const fail = (error) => {
+    removeWorker(state);
+    for (const p of state.pending.values()) {
+      clearTimeout(p.timer);
+      p.reject(error);
+    }
+    state.pending.clear();
+  };
+  proc.on('error', fail);
+  proc.stdin.on('error', fail);
+  proc.on('close', (code) => {
+    if (state.pending.size) console.error('Python worker error:', state.stderrTail);
+    fail(new Error(`Python worker exited with code ${code}: ${state.stderrTail}`));
+  });
+
+  idleWorker(state);
+  return state;
+}
+
+function removeWorker(state) {
+  const i = workers.indexOf(state);
+  if (i !== -1) workers.splice(i, 1);
+}
+
+// Idle worker first, then a fresh one while there's room, then the least loaded
+function pickWorker() {
+  let best = null;
+  for (const w of workers) {
+    if (!best || w.pending.size < best.pending.size) best = w;
+  }
+  if (best && (best.pending.size === 0 || workers.length >= POOL_SIZE)) return best;
+  const state = startWorker();
+  workers.push(state);
+  return state;
+}
+
+function dispatch(request) {
+  const state = pickWorker();
+  request.timer = setTimeout(() => timeOut(state, request), REQUEST_TIMEOUT_MS);
+  state.pending.set(request.id, request);
+  busyWorker(state);
+  state.proc.stdin.write(request.frame);
+}
+
+// The worker is stuck (or far too slow) on `request`: give up on it, kill the
+// child, and move whatever was queued behind it to another worker
+function timeOut(state, request) {
+  if (state.pending.get(request.id) !== request) return;
+  state.pending.delete(request.id);
+  removeWorker(state);
+  const queued = [...state.pending.values()];
+  state.pending.clear();
+  state.proc.kill('SIGKILL');
+
+  console.error(`Python worker timed out on ${request.op} after ${REQUEST_TIMEOUT_MS}ms:`, state.stderrTail);
+  request.reject(new Error(`Python worker timed out on ${request.op} after ${REQUEST_TIMEOUT_MS}ms`));
+  for (const q of queued) {
+    clearTimeout(q.timer);
+    try {
+      dispatch(q);
+    } catch (error) {
+      q.reject(error);
+    }
+  }
+}
+
+// Don't let an idle worker keep the Node process alive (CLI/test scripts)
+function idleWorker(state) {
+  state.proc.unref();
+  state.proc.stdout.unref();
+  state.proc.stderr.unref();
+  state.proc.stdin.unref();
+}
+
+function busyWorker(state) {
+  state.proc.ref();
+  state.proc.stdout.ref();
+  state.proc.stderr.ref();
+  state.proc.stdin.ref();
+}
+
 /**
- * Execute Python scraper script
- * @param {string} scriptPath - Path to Python script
- * @param {object} data - Data to pass to Python script
- * @returns {Promise<object>} - Scraped data
+ * Run an operation on the Python worker pool
+ * @param {string} op - One of get_calendar, get_listing, search, search_from_url
+ * @param {object} params - Parameters for the operation
+ * @returns {Promise<object>} - Operation result
  */
-export async function executePythonScript(scriptPath, data) {
+export function callPythonWorker(op, params) {
   return new Promise((resolve, reject) => {
-    const vcheck = checkPythonVersion();
-    if (!vcheck.ok) {
-      return reject(new Error(`Python version check failed: ${vcheck.message}`));
-    }
-    const pythonCmd = vcheck.cmd || process.env.PYTHON_PATH || 'python3';
-    // Create temp file for input data
-    const tempId = crypto.randomBytes(8).toString('hex');
-    const inputFile = join(process.env.TEMP_DIR || '/tmp', `input_${tempId}.json`);
-    const outputFile = join(process.env.TEMP_DIR || '/tmp', `output_${tempId}.json`);
-
     try {
-      // Write input data
-      writeFileSync(inputFile, JSON.stringify(data));
-
-      // Spawn Python process
-      const pythonProcess = spawn(pythonCmd, [
-        scriptPath,
-        inputFile,
-        outputFile
-      ]);
-
-      let stderr = '';
-
-      pythonProcess.stderr.on('data', (data) => {
-        stderr += data.toString();
-      });
-
-      pythonProcess.on('close', (code) => {
-        try {
-          // Clean up input file
-          unlinkSync(inputFile);
-
-          if (code !== 0) {
-            console.error('Python script error:', stderr);
-            reject(new Error(`Python script exited with code ${code}: ${stderr}`));
-            return;
-          }
-
-          // Read output
-          const output = readFileSync(outputFile, 'utf-8');
-          unlinkSync(outputFile);
-
-          const result = JSON.parse(output);
-          resolve(result);
-        } catch (error) {
-          reject(error);
-        }
-      });
-
-      pythonProcess.on('error', (error) => {
-        reject(error);
-      });
+      const id = nextRequestId++;
+      const payload = Buffer.from(JSON.stringify({ id, op, params }), 'utf-8');
+      const header = Buffer.alloc(4);
+      header.writeUInt32BE(payload.length, 0);
+      dispatch({ id, op, frame: Buffer.concat([header, payload]), resolve, reject, timer: null });
     } catch (error) {
       reject(error);
     }
@@ -112,22 +201,19 @@ export async function executePythonScript(scriptPath, data) {
  * Search Airbnb listings
  */
 export async function searchAirbnb(params) {
-  const scriptPath = join(process.cwd(), 'src', 'python', 'search_listings.py');
-  return await executePythonScript(scriptPath, params);
+  return await callPythonWorker('search', params);
 }
 
 /**
  * Get listing details
  */
 export async function getListingDetails(listingId) {
-  const scriptPath = join(process.cwd(), 'src', 'python', 'get_listing.py');
-  return await executePythonScript(scriptPath, { listing_id: listingId });
+  return await callPythonWorker('get_listing', { listing_id: listingId });
 }
 
 /**
  * Get calendar availability
  */
 export async function getCalendar(listingId) {
-  const scriptPath = join(process.cwd(), 'src', 'python', 'get_calendar.py');
-  return await executePythonScript(scriptPath, { listing_id: listingId });
+  return await callPythonWorker('get_calendar', { listing_id: listingId });
 }
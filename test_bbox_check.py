@@ -4,8 +4,11 @@ Dump all 97 guest-favorite results so we can cross-reference with the 23 UI resu
 and understand what's different. Also checks bbox filtering.
 """
 import pyairbnb, json
+from array import array
+from math import isnan, nan as NAN
+from _urls import TORONTO_GF_URL
 
-url = "https://www.airbnb.com/s/Toronto--Canada/homes?refinement_paths%5B%5D=%2Fhomes&place_id=ChIJpTvG15DL1IkRd8S0KlBVNTI&date_picker_type=calendar&checkin=2026-03-03&checkout=2026-03-10&adults=2&infants=1&search_type=user_map_move&query=Toronto%2C%20Canada&flexible_trip_lengths%5B%5D=one_week&monthly_start_date=2026-03-01&monthly_length=3&monthly_end_date=2026-06-01&search_mode=regular_search&price_filter_input_type=2&price_filter_num_nights=7&channel=EXPLORE&amenities%5B%5D=51&amenities%5B%5D=33&amenities%5B%5D=8&amenities%5B%5D=5&selected_filter_order%5B%5D=amenities%3A51&selected_filter_order%5B%5D=ib%3Atrue&selected_filter_order%5B%5D=amenities%3A33&selected_filter_order%5B%5D=amenities%3A8&selected_filter_order%5B%5D=price_max%3A404&selected_filter_order%5B%5D=min_beds%3A1&selected_filter_order%5B%5D=amenities%3A5&selected_filter_order%5B%5D=guest_favorite%3Atrue&update_selected_filters=false&ib=true&price_max=404&min_beds=1&guest_favorite=true&ne_lat=49.78399555676937&ne_lng=-71.16777996437563&sw_lat=37.05007652576309&sw_lng=-87.52316428221945&zoom=5.62079895446209&zoom_level=5.62079895446209&search_by_map=true"
+url = TORONTO_GF_URL
 
 # Toronto proper bounding box (much tighter than the URL's huge bbox)
 # The URL bbox covers half of Ontario — Toronto city proper is roughly:
@@ -26,26 +29,46 @@ print(f"Have coordinates: {len(has_coords)} / {len(gf)}")
 if has_coords:
     print(f"Sample coords: {has_coords[0].get('coordinates')}")
 
-# Apply Toronto bbox filter
-def in_toronto_bbox(r):
+# Apply Toronto bbox filter — pull lat/lng out once into two flat float64
+# buffers (NaN = no coords), then build the mask in one vectorised
+# comparison (plain Python over the same buffers if numpy isn't installed)
+lats = array('d')
+lngs = array('d')
+for r in gf:
     coords = r.get('coordinates') or {}
     lat = coords.get('lat') or coords.get('latitude')
     lng = coords.get('lng') or coords.get('longitude') or coords.get('lon')
     if lat is None or lng is None:
-        return True  # keep if no coords — don't false-negative
-    return TORONTO_SW_LAT <= float(lat) <= TORONTO_NE_LAT and TORONTO_SW_LNG <= float(lng) <= TORONTO_NE_LNG
+        lat = lng = NAN
+    lats.append(float(lat))
+    lngs.append(float(lng))
+
+try:
+    import numpy as np
+    lat_v = np.frombuffer(lats, dtype=np.float64)  # no copy
+    lng_v = np.frombuffer(lngs, dtype=np.float64)
+    # keep if no coords — don't false-negative
+    mask = np.isnan(lat_v) | (
+        (TORONTO_SW_LAT <= lat_v) & (lat_v <= TORONTO_NE_LAT) &
+        (TORONTO_SW_LNG <= lng_v) & (lng_v <= TORONTO_NE_LNG)
+    )
+    mask = mask.tolist()
+except ImportError:
+    mask = [
+        isnan(lat) or  # keep if no coords — don't false-negative
+        (TORONTO_SW_LAT <= lat <= TORONTO_NE_LAT and TORONTO_SW_LNG <= lng <= TORONTO_NE_LNG)
+        for lat, lng in zip(lats, lngs)
+    ]
 
-in_bbox = [r for r in gf if in_toronto_bbox(r)]
+in_bbox = [r for r, keep in zip(gf, mask) if keep]
 print(f"After Toronto bbox filter: {len(in_bbox)}")
 
 print(f"\n{'='*60}")
 print("All guest-favorite results with coords:")
 print(f"{'='*60}")
-for r in gf:
-    coords = r.get('coordinates') or {}
-    lat = coords.get('lat') or coords.get('latitude')
-    lng = coords.get('lng') or coords.get('longitude') or coords.get('lon')
-    in_box = in_toronto_bbox(r)
+for r, lat, lng, in_box in zip(gf, lats, lngs, mask):
+    if isnan(lat):
+        lat = lng = None
     room_id = r.get('room_id')
     name = r.get('name', '?')
     badges = r.get('badges', [])
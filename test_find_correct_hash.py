@@ -9,14 +9,10 @@ url = "https://a0.muscache.com/airbnb/static/packages/web/common/823b8.d594b0753
 r = cffi_requests.get(url, headers=headers, impersonate="chrome124")
 print("Status:", r.status_code)
 
-# Find ALL operationId occurrences with their surrounding context
-matches = list(re.finditer(r"name:'([^']+)'[^}]{0,200}operationId:'([0-9a-f]{64})'", r.text))
+# Find ALL operationId occurrences with their surrounding context —
+# single- and double-quoted styles in one pass
+_OP_RE = re.compile(r"""name:(?:'([^']+)'|"([^"]+)")[^}]{0,200}operationId:['"]([0-9a-f]{64})['"]""")
+matches = list(_OP_RE.finditer(r.text))
 print(f"\nFound {len(matches)} operationId entries:")
 for m in matches:
-    print(f"  name='{m.group(1)}'  hash={m.group(2)[:20]}...")
-
-# Also try with double quotes
-matches2 = list(re.finditer(r'name:"([^"]+)"[^}]{0,200}operationId:"([0-9a-f]{64})"', r.text))
-print(f"\nFound {len(matches2)} more (double-quote style):")
-for m in matches2:
-    print(f"  name='{m.group(1)}'  hash={m.group(2)[:20]}...")
+    print(f"  name='{m.group(1) or m.group(2)}'  hash={m.group(3)[:20]}...")
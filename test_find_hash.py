@@ -3,8 +3,14 @@ import re
 
 headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
 
+# One session for every fetch — keep-alive + TLS reuse to airbnb.com / muscache.com
+session = cffi_requests.Session(impersonate="chrome124", headers=headers)
+
+_KEYED_HASH_RE  = re.compile(r"""(?:operationId|sha256Hash)\s*:\s*['"]([0-9a-f]{64})['"]""")
+_QUOTED_HASH_RE = re.compile(r"""['"]([0-9a-f]{64})['"]""")
+
 # Fetch homepage to get the exact bundle URL
-homepage = cffi_requests.get("https://www.airbnb.com/", headers=headers, impersonate="chrome124")
+homepage = session.get("https://www.airbnb.com/")
 bundle_match = re.search(
     r"https://a0\.muscache\.com/airbnb/static/packages/web/[^/]+/frontend/airmetro/browser/asyncRequire\.[^\"']+\.js",
     homepage.text
@@ -12,7 +18,7 @@ bundle_match = re.search(
 bundle_url = bundle_match.group(0)
 print("Bundle URL:", bundle_url)
 
-bundle = cffi_requests.get(bundle_url, headers=headers, impersonate="chrome124")
+bundle = session.get(bundle_url)
 
 # Get the StaysSearchRoute.prepare filename
 module_match = re.search(
@@ -27,24 +33,19 @@ base_url = base.group(1) if base else "https://a0.muscache.com/airbnb/static/pac
 module_url = base_url + "common/frontend/stays-search/routes/" + module_match.group(1)
 print("Module URL:", module_url)
 
-module = cffi_requests.get(module_url, headers=headers, impersonate="chrome124")
+module = session.get(module_url)
 print("Module status:", module.status_code)
 print("Module size:", len(module.text), "chars")
 
-# Search for the hash
-hash_patterns = [
-    r'operationId:[\'"]([0-9a-f]{64})',
-    r'sha256Hash:[\'"]([0-9a-f]{64})',
-    r'"([0-9a-f]{64})"',
-    r"'([0-9a-f]{64})'",
-]
-for pat in hash_patterns:
-    matches = re.findall(pat, module.text)
-    if matches:
-        print(f"FOUND with pattern '{pat[:40]}':", matches[0])
+# Search for the hash — keyed (operationId/sha256Hash) first, then any quoted
+# 64-char hex string; search() stops at the first hit instead of findall()
+for label, pat in (("keyed", _KEYED_HASH_RE), ("quoted", _QUOTED_HASH_RE)):
+    m = pat.search(module.text)
+    if m:
+        print(f"FOUND with {label} pattern:", m.group(1))
         break
     else:
-        print(f"No match: '{pat[:40]}'")
+        print(f"No match: {label} pattern")
 
 # Print context around key terms
 for term in ['operationId', 'sha256', 'persistedQuery', 'StaysSearch']:
@@ -3,14 +3,42 @@
 Patch pyairbnb internals to intercept the raw API response before
 normalization, so we can find where ib/instant_book lives.
 """
-import pyairbnb
-import pyairbnb.search as search_mod
-import json
+import sys
+sys.path.insert(0, 'src/python')
+import fastjson
 from unittest.mock import patch
+from _urls import TORONTO_GF_URL
+
+url = TORONTO_GF_URL
+
+IB_KEY_TERMS = ('instant', 'instant_book', 'instantbook', 'is_instant')
+MAX_PATTERNS = 25
+
 
-url = "https://www.airbnb.com/s/Toronto--Canada/homes?refinement_paths%5B%5D=%2Fhomes&place_id=ChIJpTvG15DL1IkRd8S0KlBVNTI&date_picker_type=calendar&checkin=2026-03-03&checkout=2026-03-10&adults=2&infants=1&search_type=user_map_move&query=Toronto%2C%20Canada&flexible_trip_lengths%5B%5D=one_week&monthly_start_date=2026-03-01&monthly_length=3&monthly_end_date=2026-06-01&search_mode=regular_search&price_filter_input_type=2&price_filter_num_nights=7&channel=EXPLORE&amenities%5B%5D=51&amenities%5B%5D=33&amenities%5B%5D=8&amenities%5B%5D=5&selected_filter_order%5B%5D=amenities%3A51&selected_filter_order%5B%5D=ib%3Atrue&selected_filter_order%5B%5D=amenities%3A33&selected_filter_order%5B%5D=amenities%3A8&selected_filter_order%5B%5D=price_max%3A404&selected_filter_order%5B%5D=min_beds%3A1&selected_filter_order%5B%5D=amenities%3A5&selected_filter_order%5B%5D=guest_favorite%3Atrue&update_selected_filters=false&ib=true&price_max=404&min_beds=1&guest_favorite=true&ne_lat=49.78399555676937&ne_lng=-71.16777996437563&sw_lat=37.05007652576309&sw_lng=-87.52316428221945&zoom=5.62079895446209&zoom_level=5.62079895446209&search_by_map=true"
+def walk_ib_fields(o, path=()):
+    """Yield (path, value) for every key that looks like ib/instant-book and
+    every string value that is 'ib' (e.g. filterName: "ib") or mentions
+    'instant'."""
+    if isinstance(o, dict):
+        for k, v in o.items():
+            kl = str(k).lower()
+            if kl == 'ib' or any(t in kl for t in IB_KEY_TERMS):
+                yield path + (k,), v
+            yield from walk_ib_fields(v, path + (k,))
+    elif isinstance(o, list):
+        for i, v in enumerate(o):
+            yield from walk_ib_fields(v, path + (i,))
+    elif isinstance(o, str):
+        ol = o.lower()
+        if ol == 'ib' or 'instant' in ol:
+            yield path, o
+
+
+# Intercept the raw `get()` response before pyairbnb processes it — pyairbnb
+# is only needed from here on
+import pyairbnb
+import pyairbnb.search as search_mod
 
-# Intercept the raw `get()` response before pyairbnb processes it
 raw_pages = []
 original_get = search_mod.get
 
@@ -26,16 +54,29 @@ print(f"Intercepted {len(raw_pages)} API page(s), total normalized results: {len
 
 # Save raw page 1 for inspection
 if raw_pages:
-    with open('/tmp/raw_api_page1.json', 'w') as f:
-        json.dump(raw_pages[0], f, indent=2, default=str)
+    with open('/tmp/raw_api_page1.json', 'wb') as f:
+        f.write(fastjson.dumps(raw_pages[0], default=str, indent=True))
     print("Saved raw page 1 to /tmp/raw_api_page1.json")
 
-    # Try to find ib/instant_book anywhere in the raw response
-    raw_str = json.dumps(raw_pages[0], default=str).lower()
-    for term in ['instant', '"ib"', "'ib'", 'instant_book', 'instantbook', 'is_instant']:
-        idx = raw_str.find(term)
-        if idx != -1:
-            print(f"\nFound '{term}' at position {idx}:")
-            print(raw_str[max(0,idx-100):idx+200])
+    # Walk the raw response for ib/instant_book instead of serialising and
+    # lowercasing the whole page to substring-search it. The same field
+    # repeats once per listing, so hits are grouped by path with list indices
+    # collapsed to '*' — one line per pattern with a count and first example.
+    patterns = {}
+    for path, value in walk_ib_fields(raw_pages[0]):
+        pattern = '/'.join('*' if isinstance(p, int) else str(p) for p in path) or '<root>'
+        entry = patterns.get(pattern)
+        if entry is None:
+            patterns[pattern] = [1, value]
         else:
-            print(f"'{term}' NOT found in raw response")
+            entry[0] += 1
+    if not patterns:
+        print("ib / instant_book NOT found in raw response")
+    else:
+        total = sum(count for count, _ in patterns.values())
+        print(f"\n{total} hit(s) across {len(patterns)} path pattern(s):")
+        for pattern, (count, example) in list(patterns.items())[:MAX_PATTERNS]:
+            print(f"\n  {pattern}  ×{count}")
+            print(f"    e.g. {repr(example)[:200]}")
+        if len(patterns) > MAX_PATTERNS:
+            print(f"\n  ... and {len(patterns) - MAX_PATTERNS} more pattern(s)")
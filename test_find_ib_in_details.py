@@ -3,26 +3,64 @@
 1. Check paymentMessages across all 280 results for any IB signal
 2. Fetch full listing details for a few listings to see if ib is there
 """
-import pyairbnb, json
-from collections import Counter
+import asyncio
+import importlib
+import threading
+import sys
+sys.path.insert(0, 'src/python')
+import pyairbnb
+import fastjson
+from _search_cache import cached_search
+from curl_cffi import requests as cffi_requests
+from _badges import is_guest_favorite
+from _urls import TORONTO_GF_URL
 
-url = "https://www.airbnb.com/s/Toronto--Canada/homes?refinement_paths%5B%5D=%2Fhomes&place_id=ChIJpTvG15DL1IkRd8S0KlBVNTI&date_picker_type=calendar&checkin=2026-03-03&checkout=2026-03-10&adults=2&infants=1&search_type=user_map_move&query=Toronto%2C%20Canada&flexible_trip_lengths%5B%5D=one_week&monthly_start_date=2026-03-01&monthly_length=3&monthly_end_date=2026-06-01&search_mode=regular_search&price_filter_input_type=2&price_filter_num_nights=7&channel=EXPLORE&amenities%5B%5D=51&amenities%5B%5D=33&amenities%5B%5D=8&amenities%5B%5D=5&selected_filter_order%5B%5D=amenities%3A51&selected_filter_order%5B%5D=ib%3Atrue&selected_filter_order%5B%5D=amenities%3A33&selected_filter_order%5B%5D=amenities%3A8&selected_filter_order%5B%5D=price_max%3A404&selected_filter_order%5B%5D=min_beds%3A1&selected_filter_order%5B%5D=amenities%3A5&selected_filter_order%5B%5D=guest_favorite%3Atrue&update_selected_filters=false&ib=true&price_max=404&min_beds=1&guest_favorite=true&ne_lat=49.78399555676937&ne_lng=-71.16777996437563&sw_lat=37.05007652576309&sw_lng=-87.52316428221945&zoom=5.62079895446209&zoom_level=5.62079895446209&search_by_map=true"
+try:
+    import ahocorasick  # pyahocorasick — optional, one pass for all terms
+except ImportError:
+    ahocorasick = None
+
+IB_TERMS = [b'instant', b'"ib"', b'instant_book', b'is_instant']
+
+if ahocorasick is not None:
+    IB_AUTOMATON = ahocorasick.Automaton()
+    for t in IB_TERMS:
+        IB_AUTOMATON.add_word(t.decode('latin-1'), t)
+    IB_AUTOMATON.make_automaton()
+
+
+def find_terms(blob, terms=IB_TERMS):
+    """Byte offset of the first occurrence of each term in `blob`, -1 if absent."""
+    if ahocorasick is None:
+        return {t: blob.find(t) for t in terms}
+    hits = dict.fromkeys(terms, -1)
+    # latin-1 maps bytes 1:1 onto code points, so indexes stay byte offsets
+    for end, term in IB_AUTOMATON.iter(blob.decode('latin-1')):
+        if hits[term] == -1:
+            hits[term] = end - len(term) + 1
+    return hits
+
+url = TORONTO_GF_URL
 
 print("Fetching search results...")
-results = pyairbnb.search_all_from_url(url, currency="USD", proxy_url="")
+results = cached_search(url)  # cached on disk for an hour between runs
 print(f"Total: {len(results)}")
 
 # --- 1. Survey ALL paymentMessages types across all listings ---
 print("\n" + "="*60)
 print("paymentMessages types across all 280 listings:")
-msg_types = Counter()
-msg_texts = Counter()
+# Plain dicts over Counter, and the 60-char text prefixes are interned so
+# the many repeats of the same message share one string
+msg_types = {}
+msg_texts = {}
 for r in results:
     for m in (r.get('paymentMessages') or []):
-        msg_types[m.get('type', 'UNKNOWN')] += 1
-        msg_texts[m.get('text', '?')[:60]] += 1
-print("Types:", dict(msg_types.most_common(20)))
-print("Texts:", dict(msg_texts.most_common(20)))
+        kind = m.get('type', 'UNKNOWN')
+        msg_types[kind] = msg_types.get(kind, 0) + 1
+        prefix = sys.intern(m.get('text', '?')[:60])
+        msg_texts[prefix] = msg_texts.get(prefix, 0) + 1
+print("Types:", dict(sorted(msg_types.items(), key=lambda x: -x[1])[:20]))
+print("Texts:", dict(sorted(msg_texts.items(), key=lambda x: -x[1])[:20]))
 
 # --- 2. Check the raw JSON for a few listings to see every field ---
 print("\n" + "="*60)
@@ -35,15 +73,55 @@ for r in results[:3]:
     print(f"  kind: {r.get('kind')}")
 
 # --- 3. Fetch full listing details for first 3 guest-favorite listings ---
-gf_results = [r for r in results if any('GUEST_FAVORITE' in str(b).upper() for b in (r.get('badges') or []))]
+# get_details() makes several requests per listing (page, reviews, calendar,
+# ...) through pyairbnb's module-level `requests.get`, each on a fresh
+# connection. Point those modules at keep-alive Sessions instead — one per
+# thread, since the three listings are fetched concurrently below and a
+# curl_cffi Session isn't thread-safe.
+class SharedRequests:
+    """Stands in for the `curl_cffi.requests` module inside pyairbnb."""
+    def __init__(self):
+        self.local = threading.local()
+        self.sessions = []
+
+    @property
+    def session(self):
+        s = getattr(self.local, 'session', None)
+        if s is None:
+            s = self.local.session = cffi_requests.Session(impersonate="chrome124")
+            self.sessions.append(s)
+        return s
+
+    def get(self, url, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.session.post(url, **kwargs)
+
+    def close(self):
+        for s in self.sessions:
+            s.close()
+
+
+shared = SharedRequests()
+# price.py opens its own `with requests.Session()` (which would close ours), so it's left alone
+for mod_name in ('api', 'details', 'reviews', 'calendarinfo', 'host_details'):
+    try:
+        mod = importlib.import_module(f'pyairbnb.{mod_name}')
+    except ImportError:
+        continue
+    if hasattr(mod, 'requests'):
+        mod.requests = shared
+
+gf_results = [r for r in results if is_guest_favorite(r)]
 print(f"\n{'='*60}")
 print(f"Fetching get_details for first 3 guest-favorite listings...")
-for r in gf_results[:3]:
-    room_id = r.get('room_id')
-    name = r.get('name')
-    print(f"\n--- {name} (id={room_id}) ---")
-    try:
-        details = pyairbnb.get_details(
+
+
+async def fetch_details(sem, room_id):
+    async with sem:
+        return await asyncio.to_thread(
+            pyairbnb.get_details,
             room_id=room_id,
             currency="USD",
             check_in="2026-03-03",
@@ -51,16 +129,35 @@ for r in gf_results[:3]:
             adults=2,
             proxy_url=""
         )
-        # Search for ib/instant related keys
-        details_str = json.dumps(details, default=str).lower()
-        for term in ['instant', '"ib"', 'instant_book', 'is_instant']:
-            idx = details_str.find(term)
-            if idx != -1:
-                print(f"  FOUND '{term}': ...{details_str[max(0,idx-50):idx+150]}...")
-            else:
-                print(f"  '{term}': NOT in details")
-        # Print top-level keys
-        if isinstance(details, dict):
-            print(f"  top-level keys: {list(details.keys())[:20]}")
-    except Exception as e:
-        print(f"  ERROR: {e}")
+
+
+async def fetch_all_details(listings):
+    sem = asyncio.Semaphore(3)
+    return await asyncio.gather(*(fetch_details(sem, r.get('room_id')) for r in listings),
+                                return_exceptions=True)
+
+
+try:
+    fetched = asyncio.run(fetch_all_details(gf_results[:3]))
+finally:
+    shared.close()
+
+for r, details in zip(gf_results[:3], fetched):
+    room_id = r.get('room_id')
+    name = r.get('name')
+    print(f"\n--- {name} (id={room_id}) ---")
+    if isinstance(details, Exception):
+        print(f"  ERROR: {details}")
+        continue
+    # Search for ib/instant related keys — probe the encoded bytes directly
+    # rather than decoding the whole (large) details tree back to str
+    details_blob = fastjson.dumps(details, default=str).lower()
+    for term, idx in find_terms(details_blob).items():
+        if idx != -1:
+            context = details_blob[max(0,idx-50):idx+150].decode('utf-8', 'replace')
+            print(f"  FOUND '{term.decode()}': ...{context}...")
+        else:
+            print(f"  '{term.decode()}': NOT in details")
+    # Print top-level keys
+    if isinstance(details, dict):
+        print(f"  top-level keys: {list(details.keys())[:20]}")
@@ -2,21 +2,65 @@
 """
 Inspect passportData and structuredContent to find where ib/instant_book hides
 """
-import pyairbnb, json
+import io
+import sys
+from _search_cache import cached_search_json
+import fastjson
+from _urls import TORONTO_GF_URL
 
-url = "https://www.airbnb.com/s/Toronto--Canada/homes?refinement_paths%5B%5D=%2Fhomes&place_id=ChIJpTvG15DL1IkRd8S0KlBVNTI&date_picker_type=calendar&checkin=2026-03-03&checkout=2026-03-10&adults=2&infants=1&search_type=user_map_move&query=Toronto%2C%20Canada&flexible_trip_lengths%5B%5D=one_week&monthly_start_date=2026-03-01&monthly_length=3&monthly_end_date=2026-06-01&search_mode=regular_search&price_filter_input_type=2&price_filter_num_nights=7&channel=EXPLORE&amenities%5B%5D=51&amenities%5B%5D=33&amenities%5B%5D=8&amenities%5B%5D=5&selected_filter_order%5B%5D=amenities%3A51&selected_filter_order%5B%5D=ib%3Atrue&selected_filter_order%5B%5D=amenities%3A33&selected_filter_order%5B%5D=amenities%3A8&selected_filter_order%5B%5D=price_max%3A404&selected_filter_order%5B%5D=min_beds%3A1&selected_filter_order%5B%5D=amenities%3A5&selected_filter_order%5B%5D=guest_favorite%3Atrue&update_selected_filters=false&ib=true&price_max=404&min_beds=1&guest_favorite=true&ne_lat=49.78399555676937&ne_lng=-71.16777996437563&sw_lat=37.05007652576309&sw_lng=-87.52316428221945&zoom=5.62079895446209&zoom_level=5.62079895446209&search_by_map=true"
+try:
+    import ijson  # optional — stream listings one at a time
+except ImportError:
+    ijson = None
+
+url = TORONTO_GF_URL
+
+raw = cached_search_json(url)  # cached on disk for an hour between runs
+
+
+def iter_listings(raw):
+    """Yield listings from the encoded result array — streamed with ijson when
+    installed, so only one listing is materialised at a time."""
+    if ijson is None:
+        yield from fastjson.loads(raw)
+    else:
+        yield from ijson.items(io.BytesIO(raw), 'item', use_float=True)
+
+
+# One pass: keep the first 3 listings for the field dump, tally badges for
+# the rest without holding on to them
+total = 0
+first = []
+badge_counts = {}
+for r in iter_listings(raw):
+    total += 1
+    if len(first) < 3:
+        first.append(r)
+    bl = r.get('badges')
+    if not bl:
+        continue
+    for b in bl:
+        key = sys.intern(b if isinstance(b, str) else str(b))
+        badge_counts[key] = badge_counts.get(key, 0) + 1
+print(f"Total: {total}")
+
+def print_json(label, obj):
+    """print(label, <obj as indented JSON>) — encoded straight to bytes and
+    written to stdout's buffer in one call."""
+    sys.stdout.write(f"{label} ")
+    sys.stdout.flush()  # keep ordering with the text layer
+    sys.stdout.buffer.write(fastjson.dumps(obj, default=str, indent=True) + b"\n")
+    sys.stdout.buffer.flush()
 
-results = pyairbnb.search_all_from_url(url, currency="USD", proxy_url="")
-print(f"Total: {len(results)}")
 
 # Print full raw data of first 3 results
-for i, r in enumerate(results[:3]):
+for i, r in enumerate(first):
     print(f"\n{'='*60}")
     print(f"Listing {i+1}: {r.get('name','?')}")
     print(f"{'='*60}")
-    print("passportData:", json.dumps(r.get('passportData', {}), indent=2, default=str))
-    print("structuredContent:", json.dumps(r.get('structuredContent', {}), indent=2, default=str))
-    print("paymentMessages:", json.dumps(r.get('paymentMessages', []), indent=2, default=str))
+    print_json("passportData:", r.get('passportData', {}))
+    print_json("structuredContent:", r.get('structuredContent', {}))
+    print_json("paymentMessages:", r.get('paymentMessages', []))
     print("badges:", r.get('badges'))
     print("type:", r.get('type'))
     print("kind:", r.get('kind'))
@@ -25,9 +69,4 @@ for i, r in enumerate(results[:3]):
 # Badge survey across all results
 print(f"\n{'='*60}")
 print("ALL BADGES across all 280 results:")
-from collections import Counter
-badge_counts = Counter()
-for r in results:
-    for b in (r.get('badges') or []):
-        badge_counts[str(b)] += 1
-print(dict(badge_counts.most_common(30)))
+print(dict(sorted(badge_counts.items(), key=lambda x: -x[1])[:30]))
@@ -4,6 +4,7 @@ Inspect raw pyairbnb data shape to understand what fields are available
 for instant_book, guest_favorite, amenities detection
 """
 import json
+import sys
 import pyairbnb
 
 results = pyairbnb.search_all(
@@ -25,12 +26,30 @@ for i, r in enumerate(results[:3]):
 # Also scan ALL results and tally what badges appear
 print("=" * 60)
 print("ALL BADGES across all results:")
-from collections import Counter
-badge_counts = Counter()
-for r in results:
-    for b in (r.get('badges') or []):
-        badge_counts[str(b)] += 1
-print(dict(badge_counts.most_common(20)))
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    # Flatten every badge into one array and count with a C-level sort +
+    # run-length pass instead of per-badge dict updates. Ties come out in
+    # badge-name order (np.unique sorts) rather than first-seen order.
+    flat = np.array([b if isinstance(b, str) else str(b)
+                     for r in results for b in (r.get('badges') or ())], dtype=object)
+    vals, counts = np.unique(flat, return_counts=True)
+    order = np.argsort(-counts, kind='stable')[:20]
+    print({str(v): int(c) for v, c in zip(vals[order], counts[order])})
+else:
+    badge_counts = {}
+    for r in results:
+        bl = r.get('badges')
+        if not bl:
+            continue
+        for b in bl:
+            key = sys.intern(b if isinstance(b, str) else str(b))
+            badge_counts[key] = badge_counts.get(key, 0) + 1
+    print(dict(sorted(badge_counts.items(), key=lambda x: -x[1])[:20]))
 
 # Check passportData and structuredContent for instant_book hints
 print("\n--- passportData sample (first result) ---")
@@ -5,27 +5,30 @@ are returned and what search_all_from_url does.
 """
 import inspect
 import os
+import shutil
+import sys
 import pyairbnb
 
 pkg_file = inspect.getfile(pyairbnb)
 pkg_dir = os.path.dirname(pkg_file)
 print(f"pyairbnb installed at: {pkg_dir}\n")
 
-# List all .py files
-for f in sorted(os.listdir(pkg_dir)):
-    if f.endswith('.py'):
-        full = os.path.join(pkg_dir, f)
-        size = os.path.getsize(full)
-        print(f"  {f}  ({size} bytes)")
+# List all .py files — one directory scan, reused for the dump below
+with os.scandir(pkg_dir) as it:
+    entries = sorted((e for e in it if e.name.endswith('.py')), key=lambda e: e.name)
+for e in entries:
+    print(f"  {e.name}  ({e.stat().st_size} bytes)")
 
 print("\n" + "="*60)
 
 # Print every .py file in full
-for f in sorted(os.listdir(pkg_dir)):
-    if f.endswith('.py'):
-        full = os.path.join(pkg_dir, f)
-        print(f"\n\n{'='*60}")
-        print(f"FILE: {f}")
-        print('='*60)
-        with open(full) as fh:
-            print(fh.read())
+for e in entries:
+    print(f"\n\n{'='*60}")
+    print(f"FILE: {e.name}")
+    print('='*60)
+    # Copy the raw bytes straight through rather than decoding to one big str
+    sys.stdout.flush()
+    with open(e.path, 'rb') as fh:
+        shutil.copyfileobj(fh, sys.stdout.buffer, 65536)
+    sys.stdout.buffer.write(b'\n')
+    sys.stdout.buffer.flush()
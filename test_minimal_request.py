@@ -1,8 +1,9 @@
 import sys
 sys.path.insert(0, 'src/python')
-from airbnb_search import HEADERS, get_api_key
+from airbnb_search import get_api_key, request_headers, search_url
 from curl_cffi import requests as cffi_requests
 import json
+import fastjson
 
 # Test 1: Can we reach the API at all?
 api_key = get_api_key()
@@ -57,12 +58,19 @@ payload = {
     },
 }
 
-from urllib.parse import urlencode
-url = f"https://www.airbnb.com/api/v3/StaysSearch/{op_hash}?{urlencode({'operationName': 'StaysSearch', 'locale': 'en', 'currency': 'USD'})}"
-headers = {**HEADERS, "X-Airbnb-Api-Key": api_key}
+# Request envelope built once — reused as-is if this grows into a loop of probes
+url = search_url(op_hash, 'USD', 'en')
+headers = request_headers(api_key)
+session = cffi_requests.Session(impersonate="chrome124")
+
+# Encode the payload once with fastjson and send the bytes as-is, so
+# curl_cffi doesn't re-serialise the nested dict with the stdlib encoder.
+PAYLOAD_BYTES = fastjson.dumps(payload)
+
 
 print("Sending minimal request...")
-resp = cffi_requests.post(url, json=payload, headers=headers, impersonate="chrome124")
+# HEADERS already carries content-type: application/json
+resp = session.post(url, data=PAYLOAD_BYTES, headers=headers)
 print("Status:", resp.status_code)
 
 data = resp.json()
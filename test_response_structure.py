@@ -1,54 +1,187 @@
 import sys
+import os
 sys.path.insert(0, 'src/python')
-from airbnb_search import get_api_key, build_raw_params, search_page, get_op_hash
-from urllib.parse import urlparse, parse_qs
-import pyairbnb.utils as utils
-import json
+from airbnb_search import get_api_key_cached, build_raw_params, search_page, get_op_hash, _parse_qs_fast, RAW_PARAM_KEYS
+from urllib.parse import urlparse
+import threading
+import fastjson
+from collections import deque
+from itertools import islice
 
 url = "https://www.airbnb.com/s/Toronto--Canada/homes?refinement_paths%5B%5D=%2Fhomes&place_id=ChIJpTvG15DL1IkRd8S0KlBVNTI&date_picker_type=calendar&checkin=2026-03-03&checkout=2026-03-10&adults=2&infants=1&search_type=filter_change&query=Toronto%2C%20Canada&flexible_trip_lengths%5B%5D=one_week&monthly_start_date=2026-03-01&monthly_length=3&monthly_end_date=2026-06-01&search_mode=regular_search&price_filter_input_type=2&price_filter_num_nights=7&channel=EXPLORE&amenities%5B%5D=51&amenities%5B%5D=33&amenities%5B%5D=8&amenities%5B%5D=5&selected_filter_order%5B%5D=amenities%3A51&selected_filter_order%5B%5D=ib%3Atrue&selected_filter_order%5B%5D=amenities%3A33&selected_filter_order%5B%5D=amenities%3A8&selected_filter_order%5B%5D=price_max%3A404&selected_filter_order%5B%5D=min_beds%3A1&selected_filter_order%5B%5D=amenities%3A5&selected_filter_order%5B%5D=guest_favorite%3Atrue&update_selected_filters=false&ib=true&price_max=404&min_beds=1&guest_favorite=true"
 
-qs = parse_qs(urlparse(url).query)
+qs = _parse_qs_fast(urlparse(url).query, keep=RAW_PARAM_KEYS)
 raw_params = build_raw_params(qs)
-api_key = get_api_key()
+api_key = get_api_key_cached()
 op_hash = get_op_hash()
 print("Using hash:", op_hash[:16])
 
 data = search_page(api_key, "", raw_params, "USD", "en", op_hash)
 
-# Save full response
-with open('/tmp/raw_response2.json', 'w') as f:
-    json.dump(data, f, indent=2, default=str)
-print("Saved to /tmp/raw_response2.json")
+# Intern every dict key in place so repeated keys ("id", "name", ...) share one
+# string with the literals used below and compare by pointer in the lookups.
+def intern_keys(root):
+    stack = [root]
+    pop, push, intern = stack.pop, stack.append, sys.intern
+    while stack:
+        obj = pop()
+        t = type(obj)
+        if t is dict:
+            items = [(intern(k) if type(k) is str else k, v) for k, v in obj.items()]
+            obj.clear()
+            obj.update(items)
+            for _, v in items:
+                if type(v) in (dict, list):
+                    push(v)
+        elif t is list:
+            for v in obj:
+                if type(v) in (dict, list):
+                    push(v)
+    return root
+
+
+intern_keys(data)
+
+# Save full response on a background thread; the diagnostics below only read `data`.
+# AIRBNB_DEBUG=1 keeps the indented, human-readable dump; otherwise it's compact
+# JSON, zstd-framed when the zstandard package is installed.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+if os.getenv('AIRBNB_DEBUG') or zstandard is None:
+    DUMP_PATH = '/tmp/raw_response2.json'
+else:
+    DUMP_PATH = '/tmp/raw_response2.json.zst'
+
+
+def dump_response(obj, path=DUMP_PATH):
+    debug = bool(os.getenv('AIRBNB_DEBUG'))
+    payload = fastjson.dumps(obj, default=str, indent=debug)
+    with open(path, 'wb') as f:
+        if path.endswith('.zst'):
+            with zstandard.ZstdCompressor(level=3).stream_writer(f) as w:
+                w.write(payload)
+        else:
+            f.write(payload)
+
+
+dump_thread = threading.Thread(target=dump_response, args=(data,))
+dump_thread.start()
 
 # Check errors
 if data.get('errors'):
-    print("ERRORS:", json.dumps(data['errors'], indent=2))
+    print("ERRORS:", fastjson.dumps(data['errors'], indent=True).decode())
 
 # Walk the data tree to find where listings are
-def find_listings(obj, path=""):
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            new_path = f"{path}.{k}" if path else k
-            if k in ('searchResults', 'listings', 'results', 'items', 'edges', 'nodes'):
-                print(f"  FOUND key '{k}' at {new_path}: type={type(v).__name__} len={len(v) if isinstance(v, (list,dict)) else 'N/A'}")
-                if isinstance(v, list) and len(v) > 0:
-                    print(f"    First item keys: {list(v[0].keys()) if isinstance(v[0], dict) else type(v[0])}")
-            find_listings(v, new_path)
-    elif isinstance(obj, list) and len(obj) > 0:
-        find_listings(obj[0], f"{path}[0]")
+LISTING_KEYS = frozenset(('searchResults', 'listings', 'results', 'items', 'edges', 'nodes'))
+
+
+def build_scanner(keys):
+    """Return scan(root), yielding (key, value, path) for every dict entry whose key is in `keys`.
+
+    Hits come out lazily in depth-first order, so a caller that only needs
+    the first few can stop the walk early (itertools.islice).
+
+    Paths are kept as (parent, key) chains — None standing for "[0]" — and
+    only formatted when a key matches, so non-matching nodes cost a tuple,
+    not an f-string.
+    """
+    keys = frozenset(keys)
+    containers = (dict, list)
+
+    def materialize(chain):
+        segs = []
+        while chain is not None:
+            chain, seg = chain
+            segs.append(seg)
+        path = ""
+        for seg in reversed(segs):
+            if seg is None:
+                path += "[0]"
+            else:
+                path = f"{path}.{seg}" if path else seg
+        return path
+
+    def scan(root):
+        # Explicit stack instead of recursion; children are pushed in reverse so
+        # nodes still pop in the original depth-first, key-order sequence.
+        stack = deque([(None, root, None)])
+        pop, extend, push = stack.pop, stack.extend, stack.append
+        while stack:
+            key, obj, chain = pop()
+            if key in keys:
+                yield key, obj, materialize(chain)
+            t = type(obj)
+            if t is dict:
+                # Scalars under non-target keys can never produce a hit, so
+                # they are dropped here instead of being pushed and popped.
+                children = [(k, v, (chain, k)) for k, v in obj.items() if k in keys or type(v) in containers]
+                children.reverse()
+                extend(children)
+            elif t is list and obj:
+                push((None, obj[0], (chain, None)))
+
+    return scan
+
+
+def report_listings(key, value, path):
+    tv = type(value)
+    n = len(value) if tv is list or tv is dict else 'N/A'
+    print(f"  FOUND key '{key}' at {path}: type={tv.__name__} len={n}")
+    if tv is list and value:
+        first = value[0]
+        print(f"    First item keys: {list(first.keys()) if type(first) is dict else type(first)}")
+
+
+find_listings = build_scanner(LISTING_KEYS)
+
+# Where the listings normally live; the known-path probes below are all
+# prefixes of it, so one descent covers them
+PROBE_PATH = ("data", "presentation", "staysSearch", "results", "searchResults")
+PROBE_DEPTHS = (5, 4, 3)
+
+
+def probe_prefixes(obj, parts, default):
+    """Value at each prefix of `parts` (index i -> parts[:i+1]), `default` past the first miss.
+
+    Same rule as pyairbnb.utils.get_nested_value: a missing, None or {} step is "not found".
+    """
+    values = []
+    for k in parts:
+        obj = obj.get(k, {}) if type(obj) is dict else {}
+        if obj == {} or obj is None:
+            break
+        values.append(obj)
+    values.extend([default] * (len(parts) - len(values)))
+    return values
+
 
 print("\nSearching for listing arrays in response:")
-find_listings(data)
+hits = find_listings(data)
+if '--first' in sys.argv[1:]:
+    # Only the canonical listings array is wanted: read it straight off its
+    # known path, and only walk (stopping at the first searchResults) when
+    # the response has moved it
+    listings = probe_prefixes(data, PROBE_PATH, None)[-1]
+    if listings is not None:
+        hits = iter([(PROBE_PATH[-1], listings, ".".join(PROBE_PATH))])
+    else:
+        hits = islice((hit for hit in hits if hit[0] == 'searchResults'), 1)
+for hit in hits:
+    report_listings(*hit)
 
 # Also check specific known paths
-for path in [
-    "data.presentation.staysSearch.results.searchResults",
-    "data.presentation.staysSearch.results",
-    "data.presentation.staysSearch",
-]:
-    val = utils.get_nested_value(data, path, "NOT_FOUND")
-    t = type(val).__name__
-    l = len(val) if isinstance(val, (list, dict)) else "N/A"
-    print(f"\n{path}: type={t} len={l}")
-    if isinstance(val, dict):
+probed = probe_prefixes(data, PROBE_PATH, "NOT_FOUND")
+for depth in PROBE_DEPTHS:
+    path = ".".join(PROBE_PATH[:depth])
+    val = probed[depth - 1]
+    tv = type(val)
+    l = len(val) if tv is list or tv is dict else "N/A"
+    print(f"\n{path}: type={tv.__name__} len={l}")
+    if tv is dict:
         print(f"  keys: {list(val.keys())}")
+
+dump_thread.join()
+print(f"\nSaved to {DUMP_PATH}")